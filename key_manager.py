@@ -1,5 +1,5 @@
-from Crypto.Cipher import AES
-from Crypto.Hash import CMAC
+# 키 파생은 패키지의 공용 암호 코어를 사용합니다 (src 경로는 실행 스크립트가 설정).
+from ntag424_python.crypto import cmac_for
 
 # 마스터 키 저장소
 # 현재는 테스트를 위해 모든 키를 00으로 설정했습니다.
@@ -30,10 +30,5 @@ def get_derived_key(key_no, uid):
     master_key = MASTER_KEYS.get(key_no, bytes(16))
     
     # AES-CMAC 알고리즘을 사용하여 키 파생
-    # 입력 데이터(Msg)로 UID를 사용
-    cobj = CMAC.new(master_key, ciphermod=AES)
-    cobj.update(uid)
-    
-    derived_key = cobj.digest()
-    
-    return derived_key
+    # 입력 데이터(Msg)로 UID를 사용. 마스터 키별 CMAC 서브키는 캐시되어 재사용됩니다.
+    return cmac_for(master_key).mac(uid)
@@ -0,0 +1,102 @@
+import argparse
+import os
+import sys
+from urllib.parse import urlsplit
+
+# src 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+
+from key_manager import MASTER_KEYS, get_derived_key
+from ntag424_python.loadgen import (
+    DEFAULT_MIX,
+    Kind,
+    SunUrlGenerator,
+    http_target,
+    read_urls,
+    run_load,
+    serve_verifier,
+    uid_router,
+    write_urls,
+)
+from ntag424_python.verify import SunVerifier
+
+# main.py의 SDM 설정: SDMMetaRead=Key2, SDMFileRead=Key1
+META_READ_KEY_NO = 2
+FILE_READ_KEY_NO = 1
+TARGET_URL = "https://challenge.walkd.co.kr/dashboard"
+
+
+def file_read_key_for(uid):
+    return get_derived_key(FILE_READ_KEY_NO, uid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SUN URL 검증 서버 부하 테스트")
+    parser.add_argument("--count", type=int, default=100_000, help="생성할 URL 수")
+    parser.add_argument("--tags", type=int, default=1000, help="가상 태그 수")
+    parser.add_argument("--url", default=TARGET_URL, help="태그에 기록된 기본 URL")
+    parser.add_argument("--out", help="URL을 파일로만 기록 (검증기로 보내지 않음)")
+    parser.add_argument("--replay-file", help="기록해 둔 URL 파일을 검증기로 보냄")
+    parser.add_argument(
+        "--target", default="inproc",
+        help="inproc | loopback | http://host:port (외부 검증 서버)",
+    )
+    parser.add_argument("--rate", type=float, help="초당 요청 수 상한")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int)
+    for kind in Kind:
+        parser.add_argument(
+            f"--{kind.value.replace('_', '-')}",
+            type=float,
+            default=DEFAULT_MIX[kind],
+            help=f"{kind.value} 비율",
+        )
+    args = parser.parse_args()
+
+    meta_read_key = MASTER_KEYS[META_READ_KEY_NO]
+
+    if args.replay_file:
+        items = read_urls(args.replay_file)
+    else:
+        mix = {kind: getattr(args, kind.value) for kind in Kind}
+        generator = SunUrlGenerator(
+            args.url, meta_read_key, file_read_key_for, args.tags, mix, args.seed
+        )
+        items = generator.generate(args.count)
+
+    if args.out:
+        print(f"✍️ {write_urls(items, args.out)}건 기록: {args.out}")
+        return
+
+    verifier = SunVerifier(meta_read_key, file_read_key_for)
+
+    def verify(url):
+        return verifier.verify(url).valid
+
+    server = None
+    if args.target == "inproc":
+        target = verify
+    elif args.target == "loopback":
+        parts = urlsplit(args.url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        server = serve_verifier(verify, origin)
+        target = http_target(f"http://127.0.0.1:{server.server_address[1]}")
+    else:
+        target = http_target(args.target)
+
+    print(
+        f"🚀 부하 테스트 시작 (target={args.target}, "
+        f"concurrency={args.concurrency}, rate={args.rate})"
+    )
+    # 같은 UID의 URL은 한 워커가 보낸 순서대로 처리해야
+    # SDMReadCtr 재사용 판정이 맞습니다.
+    route = uid_router(meta_read_key)
+    report = run_load(items, target, args.rate, args.concurrency, route)
+    print(report.summary())
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,37 @@
+import os
 import time
 import sys
+
+# src 경로 설정 (레이아웃 계산은 패키지 코드를 사용)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+
 from ntag424 import NTAG424
 from key_manager import get_derived_key, MASTER_KEYS
+from ntag424_python.layout import calculate_layout
+from ntag424_python.metrics import Regulator, StationMetrics, serve_metrics
+from ntag424_python.session import Step
 
 # 공장 초기화 키
 FACTORY_KEY = bytes(16)
 
-def calculate_offsets(base_url):
+# SDMENCFileData로 암호화 미러링할 태그별 평문 길이 (16의 배수, 0이면 사용 안 함)
+# 예: TAG_PAYLOAD_LENGTH = 16
+TAG_PAYLOAD_LENGTH = 0
+
+
+def tag_payload(uid):
     """
-    URL 길이와 NDEF 헤더를 고려하여 암호화 데이터가 들어갈 위치(Offset)를 계산합니다.
+    태그마다 기록할 SDMENCFileData 평문 (TAG_PAYLOAD_LENGTH 바이트, ASCII).
+    기본값은 UID(hex) 뒤를 임의 hex로 채운 토큰이고, UID를 모르면(Random ID 등)
+    전부 임의 값입니다. 발급 시스템의 토큰을 쓰려면 이 함수를 바꾸세요.
     """
-    # 1. 구분자 결정 (? 또는 &)
-    separator = "&" if "?" in base_url else "?"
-    
-    # 2. NDEF 파일 구조 (Type 4 Tag 표준)
-    # [File Length (2bytes)] + [NDEF Header (5bytes)] + [Payload (URL...)]
-    # - File Length: 전체 NDEF 메시지의 길이 (Big Endian)
-    # - NDEF Header: D1(Record) + 01(TypeLen) + PLen(PayloadLen) + 55(URI) + 00(NoPrefix)
-    # 따라서 실제 URL 데이터는 파일의 7번째 바이트(인덱스 7)부터 시작됩니다.
-    file_header_len = 2
-    record_header_len = 5
-    total_header_len = file_header_len + record_header_len # 총 7바이트
-    
-    # 3. PICC Data Offset (암호화 데이터 위치)
-    # [헤더 7바이트] + [URL] + [? 또는 &] + [enc=]
-    # "enc=" 는 4글자
-    enc_param = "enc="
-    cmac_param = "&cmac="
-    
-    picc_data_offset = total_header_len + len(base_url) + len(separator) + len(enc_param)
-    
-    # 4. CMAC Offset (인증 코드 위치)
-    # picc_data_offset + 암호화데이터(32) + "&cmac=" 길이
-    cmac_offset = picc_data_offset + 32 + len(cmac_param)
-    
-    # 5. 최종 URL 템플릿 생성
-    full_url = f"{base_url}{separator}{enc_param}{'0'*32}{cmac_param}{'0'*16}"
-    
-    return full_url, picc_data_offset, cmac_offset
+    known = uid.hex().upper() if any(uid) else ""
+    token = known + os.urandom(TAG_PAYLOAD_LENGTH).hex().upper()
+    return token[:TAG_PAYLOAD_LENGTH].encode()
+
+# 라인 모니터링 엔드포인트 (GET /metrics, POST /regulator?max_delay=2)
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9424
 
 def main():
     print("\n=== NTAG 424 DNA 설정 도구 (WalkD Ver.) ===")
@@ -46,18 +40,32 @@ def main():
     # 설정할 URL 정보
     target_url = "https://challenge.walkd.co.kr/dashboard"
 
+    metrics = StationMetrics()
+    # 실패가 잦으면 재시도 간격을 0.5초부터 최대 5초까지 늘립니다.
+    regulator = Regulator(metrics, base_delay=0.5, max_delay=5.0)
+    server = serve_metrics(metrics, regulator, METRICS_HOST, METRICS_PORT)
+    print(f"📊 지표: http://{METRICS_HOST}:{server.server_address[1]}/metrics")
+
     while True:
+        run = None
         try:
             tag = NTAG424()
             
             # 1. 연결 시도 (태그 없으면 재시도)
+            t0 = time.monotonic()
             if not tag.connect():
                 # 리더기는 있지만 태그가 없는 경우를 위해 잠시 대기
                 time.sleep(0.2)
                 continue
+            reader = str(tag.reader)
+            run = metrics.begin(reader, started=t0)
+            metrics.record_step(reader, Step.CONNECT, time.monotonic() - t0)
             
-            if not tag.select_app():
-                # 태그는 있는데 NTAG 424가 아닌 경우
+            with run.step(Step.SELECT):
+                selected = tag.select_app()
+            if not selected:
+                # 태그는 있는데 NTAG 424가 아닌 경우 (처리 실패로 세지 않음)
+                run = None
                 tag.disconnect()
                 time.sleep(0.2)
                 continue
@@ -67,65 +75,65 @@ def main():
             # 2. 인증 (Key 0)
             # 여기서는 편의상 공장 키(00..00)로 시도합니다. 
             # (이미 키가 변경된 태그라면 get_derived_key를 사용하도록 수정 필요)
-            if not tag.authenticate_ev2_first(key_no=0, key=FACTORY_KEY):
+            with run.step(Step.AUTH):
+                authenticated = tag.authenticate_ev2_first(key_no=0, key=FACTORY_KEY)
+            if not authenticated:
                 print("❌ 인증 실패 (Key 0 불일치)")
                 print("   (이미 설정된 태그라면 키가 변경되었을 수 있습니다)")
                 tag.disconnect()
-                time.sleep(2)
+                run.finish(Step.AUTH)
+                time.sleep(regulator.update(reader).retry_delay)
                 continue
+
+            # 처리 기록에 남길 UID. 리더기가 7바이트 UID를 알려 주지 않으면
+            # (Random ID 태그 등) 0으로 채운 UID가 기록됩니다.
+            uid = tag.reader_uid()
+            if uid is not None and len(uid) == 7:
+                run.uid = uid
                 
             # 3. 오프셋 및 URL 계산
-            full_url, picc_offset, cmac_offset = calculate_offsets(target_url)
-            print(f"   ℹ️ 목표 URL: {full_url}")
-            print(f"   📍 계산된 오프셋: Enc={picc_offset}, CMAC={cmac_offset}")
+            layout = calculate_layout(target_url, TAG_PAYLOAD_LENGTH)
+            print(f"   ℹ️ 목표 URL: {layout.url}")
+            print(
+                f"   📍 계산된 오프셋: Enc={layout.picc_data_offset}, "
+                f"CMAC={layout.cmac_offset}"
+            )
+            if TAG_PAYLOAD_LENGTH:
+                print(
+                    f"   🔒 암호화 파일 데이터: Offset={layout.enc_offset}, "
+                    f"Length={layout.enc_length}"
+                )
 
             # 4. 파일 설정 변경 (ChangeFileSettings)
             # 권한: Read=Free(E), Write=Key0(0) -> 00E0
             file_access = bytes.fromhex("00E0")
             
             # SDM 옵션: UID Mirror(Bit7)=1 | ReadCtr Mirror(Bit6)=1 | ASCII(Bit0)=1 -> C1
-            sdm_opts = bytes([0xC1])
-            
+            #          (TAG_PAYLOAD_LENGTH 사용 시 SDMENCFileData(Bit4)=1 -> D1)
             # SDM 권한: MetaRead=Key2(2), FileRead=Key1(1), CtrRet=Key1(1)
             # Hex F121 -> LSB 전송 [F1, 21]
-            sdm_access = bytes.fromhex("F121")
-
-            change_params = (
-                sdm_opts +
-                sdm_access +
-                picc_offset.to_bytes(3, 'little') +
-                bytes.fromhex("000000") +
-                cmac_offset.to_bytes(3, 'little')
-            )
+            change_params = layout.sdm_params(meta_read=2, file_read=1, ctr_ret=1)
 
-            if not tag.change_file_settings(2, file_access, change_params):
+            with run.step(Step.SETTINGS):
+                changed = tag.change_file_settings(2, file_access, change_params)
+            if not changed:
                 print("❌ 파일 설정 변경 실패")
                 tag.disconnect()
+                run.finish(Step.SETTINGS)
+                time.sleep(regulator.update(reader).retry_delay)
                 continue
 
-            # 5. NDEF 데이터 쓰기 (Type 4 Tag 표준 포맷) [중요]
-            # 구조: [Length(2)] + [Header(5)] + https://en.wikipedia.org/wiki/String
-            
-            url_bytes = full_url.encode('ascii')
-            
-            # NDEF 레코드 헤더 (5바이트)
-            # D1: Record Start/End, Well-Known Type
-            # 01: Type Length (1)
-            # Payload Length: URL길이 + 1 (Prefix 0x00 포함)
-            # 55: Type 'U' (URI)
-            # 00: ID Code (None)
-            payload_len = len(url_bytes) + 1
-            ndef_record_header = bytes([0xD1, 0x01, payload_len, 0x55, 0x00])
-            
-            # 전체 메시지 (헤더 + 데이터)
-            ndef_message = ndef_record_header + url_bytes
-            
-            # 파일에 쓸 데이터: 맨 앞에 2바이트 길이(Big Endian) 추가
-            total_len = len(ndef_message)
-            file_data = total_len.to_bytes(2, 'big') + ndef_message
+            # 5. NDEF 데이터 쓰기 (Type 4 Tag 표준 포맷)
+            # 구조: [Length(2)] + [Header(5): D1 01 PLen 55 00] + URL
+            payload = tag_payload(run.uid) if TAG_PAYLOAD_LENGTH else b""
+            if payload:
+                print(f"   🔑 태그 평문: {payload.decode()}")
+            file_data = layout.file_data(payload)
 
             print("✍️ NDEF 데이터 쓰는 중...")
-            if tag.write_data_plain(2, file_data):
+            with run.step(Step.WRITE):
+                written = tag.write_data_plain(2, file_data)
+            if written:
                 print(f"✅ [성공] 설정 완료!")
                 print(f"👉 핸드폰을 태그하여 확인해보세요.")
                 print(f"   예상 URL: {target_url}?enc=...&cmac=...")
@@ -133,16 +141,25 @@ def main():
                 print("❌ 데이터 쓰기 실패")
 
             tag.disconnect()
+            run.finish(Step.NONE if written else Step.WRITE)
+            regulator.update(reader)
             print("💤 3초간 대기 (태그를 떼주세요)...")
             time.sleep(3)
 
         except KeyboardInterrupt:
             print("\n종료합니다.")
+            server.shutdown()
             break
         except Exception as e:
             # 연결 오류 등은 무시하고 재시도 (리더기 연결 실패 에러 방지)
             # print(f"오류: {e}") 
-            time.sleep(0.5)
+            if run is None:
+                time.sleep(0.5)
+                continue
+            # 태그 처리 도중의 오류(태그 이탈 등)는 실패로 기록하고
+            # 조절기 간격만큼 쉽니다.
+            run.finish(error=e)
+            time.sleep(regulator.update(run.reader).retry_delay)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
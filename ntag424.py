@@ -1,23 +1,33 @@
 import os
 from Crypto.Cipher import AES
-from Crypto.Hash import CMAC
 from Crypto.Util.Padding import pad
-from smartcard.System import readers
+
+# CMAC/MACt는 패키지의 공용 암호 코어를 사용합니다 (src 경로는 실행 스크립트가 설정).
+from ntag424_python.crypto import Cmac
 
 class NTAG424:
     NTAG424_AID = [0xD2, 0x76, 0x00, 0x00, 0x85, 0x01, 0x01]
     DEFAULT_KEY = bytes.fromhex("00000000000000000000000000000000")
 
+    # 대량 세션 생성 시 인스턴스 dict 비용을 없애기 위해 슬롯을 고정합니다.
+    __slots__ = (
+        "connection", "reader", "session_enc_key", "session_mac_key", "session_mac",
+        "ti", "cmd_ctr",
+    )
+
     def __init__(self):
         self.connection = None
         self.reader = None
         self.session_enc_key = None
         self.session_mac_key = None
+        self.session_mac = None  # 세션 MAC 키의 Cmac (인증할 때마다 새로 만듦)
         self.ti = None
         self.cmd_ctr = 0
 
     def connect(self):
         """리더기에 연결하고 첫 번째 카드를 찾습니다."""
+        # pyscard는 실제 연결 시점에 로드합니다 (검증 전용 환경에서는 불필요).
+        from smartcard.System import readers
         try:
             r_list = readers()
             if not r_list: return False
@@ -33,6 +43,16 @@ class NTAG424:
             try: self.connection.disconnect()
             except: pass
 
+    def reader_uid(self):
+        """
+        리더기가 충돌 방지 단계에서 받은 UID를 PC/SC GET DATA로 읽습니다.
+        리더기가 지원하지 않으면 None (Random ID 태그면 4바이트 임시 값).
+        """
+        if not self.connection: return None
+        resp, sw1, sw2 = self.connection.transmit([0xFF, 0xCA, 0x00, 0x00, 0x00])
+        if sw1 != 0x90 or sw2 != 0x00: return None
+        return bytes(resp)
+
     def select_app(self):
         """NTAG 424 DNA 애플리케이션을 선택합니다."""
         if not self.connection: return False
@@ -83,13 +103,8 @@ class NTAG424:
             sv1 = bytes.fromhex("A55A00010080") + context
             sv2 = bytes.fromhex("5AA500010080") + context
             
-            cmac_enc = CMAC.new(key, ciphermod=AES)
-            cmac_enc.update(sv1)
-            self.session_enc_key = cmac_enc.digest()
-            
-            cmac_mac = CMAC.new(key, ciphermod=AES)
-            cmac_mac.update(sv2)
-            self.session_mac_key = cmac_mac.digest()
+            self.session_enc_key, self.session_mac_key = Cmac(key).mac_many([sv1, sv2])
+            self.session_mac = Cmac(self.session_mac_key)
             return True
         return False
 
@@ -106,10 +121,8 @@ class NTAG424:
     def _calc_mac(self, cmd_code, cmd_header, enc_data):
         """명령어에 대한 CMAC을 계산합니다."""
         mac_input = bytes([cmd_code]) + self.cmd_ctr.to_bytes(2, 'little') + self.ti + cmd_header + enc_data
-        cmac_obj = CMAC.new(self.session_mac_key, ciphermod=AES)
-        cmac_obj.update(mac_input)
-        full_mac = cmac_obj.digest()
-        return full_mac[1::2] # 짝수 바이트만 추출하여 8바이트로 단축
+        # 홀수 인덱스 바이트만 추출하여 8바이트로 단축
+        return self.session_mac.mac_t(mac_input)
 
     def change_file_settings(self, file_no, access_rights, change_params):
         """
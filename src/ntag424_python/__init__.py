@@ -3,4 +3,23 @@ NTAG424 Python Library
 A Python library for interacting with NTAG424 NFC tags.
 """
 
-__version__ = "0.1.0"
\ No newline at end of file
+__version__ = "0.1.0"
+
+from .session import SessionState, Step, TagResult, VerificationResult
+
+__all__ = [
+    "NTAG424Driver",
+    "SessionState",
+    "Step",
+    "TagResult",
+    "VerificationResult",
+]
+
+
+def __getattr__(name: str) -> type:
+    # 드라이버(PC/SC 전송 계층)는 처음 사용할 때 로드합니다.
+    # 검증 워커처럼 리더기를 쓰지 않는 프로세스는 pyscard 비용을 지불하지 않습니다.
+    if name == "NTAG424Driver":
+        from .driver import NTAG424Driver
+        return NTAG424Driver
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
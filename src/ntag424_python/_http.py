@@ -0,0 +1,24 @@
+"""
+내부용 로컬 HTTP 서버 도우미 (지표 엔드포인트, 루프백 검증 서버).
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Type
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """요청마다 stderr에 접근 로그를 찍지 않는 핸들러 (부하 측정과 무인 스테이션용)."""
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def serve_in_background(
+    handler: Type[BaseHTTPRequestHandler], host: str, port: int
+) -> ThreadingHTTPServer:
+    """handler로 HTTP 서버를 띄워 데몬 스레드에서 돌립니다. 종료는 shutdown()."""
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,40 @@
+"""
+크기 제한이 있는 메모이즈용 캐시.
+
+가득 차면 가장 먼저 넣은 항목부터 버립니다 (FIFO). dict는 삽입 순서를 유지하므로
+별도의 연결 리스트 없이 첫 번째 키가 가장 오래된 항목입니다.
+"""
+
+import threading
+from typing import Dict, Generic, Optional, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class BoundedCache(Generic[K, V]):
+    """최대 max_size개까지 보관하는 FIFO 캐시. 여러 스레드에서 써도 됩니다."""
+
+    __slots__ = ("max_size", "_items", "_lock")
+
+    def __init__(self, max_size: int):
+        if max_size <= 0:
+            raise ValueError("max_size는 1 이상이어야 합니다.")
+        self.max_size = max_size
+        self._items: Dict[K, V] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def get(self, key: K) -> Optional[V]:
+        return self._items.get(key)
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            if key not in self._items and len(self._items) >= self.max_size:
+                del self._items[next(iter(self._items))]
+            self._items[key] = value
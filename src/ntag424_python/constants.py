@@ -13,6 +13,11 @@ CMD_AUTH_EV2_FIRST_PART2 = 0xAF
 CMD_CHANGE_FILE_SETTINGS = 0x5F
 CMD_WRITE_DATA = 0x8D
 CMD_READ_DATA = 0xAD
+CMD_READ_SIG = 0x3C
+CMD_GET_CARD_UID = 0x51
+
+# PC/SC GET DATA (리더기가 충돌 방지 단계에서 받은 UID)
+PCSC_GET_UID_APDU = [0xFF, 0xCA, 0x00, 0x00, 0x00]
 
 # Response Codes
 SW_SUCCESS = 0x90
@@ -0,0 +1,110 @@
+"""
+공용 암호 코어: AES-CMAC(NIST SP 800-38B), MACt 단축, 상수 시간 비교.
+
+드라이버의 명령 MAC, SDM 세션 키 유도, 서버 측 SDMMAC 검증이 모두 이 모듈을
+거칩니다. 키마다 AES 객체와 서브키(K1, K2)를 한 번만 만들어 두고, 메시지마다
+AES 블록 연산만 수행합니다.
+"""
+
+import hmac
+from functools import lru_cache
+from typing import Iterable, List
+
+from Crypto.Cipher import AES
+
+BLOCK_SIZE = 16
+MAC_T_SIZE = 8
+ZERO_BLOCK = bytes(BLOCK_SIZE)
+
+_RB = 0x87
+_MASK = (1 << 128) - 1
+# 마지막 블록 앞부분이 이보다 길면 블록 단위 파이썬 루프 대신 CBC 객체로 처리합니다.
+# pycryptodome 4.0 기준 측정: 32바이트까지는 루프가, 64바이트부터는 CBC 객체 생성
+# 비용을 감안해도 CBC가 빠르고, 48바이트에서 비슷합니다.
+_CBC_THRESHOLD = 3 * BLOCK_SIZE
+
+
+def _dbl(value: int) -> int:
+    """GF(2^128)에서 x2 (서브키 생성)."""
+    value <<= 1
+    return (value & _MASK) ^ _RB if value >> 128 else value
+
+
+def truncate_mac(full_mac: bytes) -> bytes:
+    """MACt: 16바이트 CMAC의 홀수 인덱스 바이트(1, 3, ..., 15)만 취한 8바이트."""
+    return full_mac[1::2]
+
+
+def compare(a: bytes, b: bytes) -> bool:
+    """MAC 비교는 항상 상수 시간으로 수행합니다."""
+    return hmac.compare_digest(a, b)
+
+
+class Cmac:
+    """
+    키 하나에 대한 AES-CMAC 계산기.
+
+    AES ECB 객체와 서브키를 미리 만들어 두므로, 같은 키로 여러 메시지를
+    MAC할 때 Crypto.Hash.CMAC.new()를 매번 호출하는 것보다 빠릅니다.
+    """
+
+    __slots__ = ("_key", "_encrypt", "_k1", "_k2")
+
+    def __init__(self, key: bytes):
+        self._key = bytes(key)
+        self._encrypt = AES.new(self._key, AES.MODE_ECB).encrypt
+        l_value = int.from_bytes(self._encrypt(ZERO_BLOCK), 'big')
+        self._k1 = _dbl(l_value)
+        self._k2 = _dbl(self._k1)
+
+    def mac(self, msg: bytes) -> bytes:
+        """16바이트 전체 CMAC."""
+        n = len(msg)
+        full_blocks = n and (n - 1) // BLOCK_SIZE
+        split = full_blocks * BLOCK_SIZE
+        last = msg[split:]
+        if len(last) == BLOCK_SIZE:
+            last_value = int.from_bytes(last, 'big') ^ self._k1
+        else:
+            padded = last + b"\x80" + bytes(BLOCK_SIZE - 1 - len(last))
+            last_value = int.from_bytes(padded, 'big') ^ self._k2
+
+        if split > _CBC_THRESHOLD:
+            cbc = AES.new(self._key, AES.MODE_CBC, ZERO_BLOCK)
+            chain = cbc.encrypt(msg[:split])[-BLOCK_SIZE:]
+            x = int.from_bytes(chain, 'big')
+        else:
+            encrypt = self._encrypt
+            x = 0
+            for i in range(0, split, BLOCK_SIZE):
+                x ^= int.from_bytes(msg[i:i + BLOCK_SIZE], 'big')
+                x = int.from_bytes(encrypt(x.to_bytes(BLOCK_SIZE, 'big')), 'big')
+        return self._encrypt((x ^ last_value).to_bytes(BLOCK_SIZE, 'big'))
+
+    def mac_t(self, msg: bytes) -> bytes:
+        """8바이트 MACt (NTAG 424 보안 메시징 / SDMMAC 형식)."""
+        return self.mac(msg)[1::2]
+
+    def mac_many(self, msgs: Iterable[bytes]) -> List[bytes]:
+        """같은 키로 여러 메시지의 전체 CMAC을 한 번에 계산합니다."""
+        mac = self.mac
+        return [mac(msg) for msg in msgs]
+
+    def mac_t_many(self, msgs: Iterable[bytes]) -> List[bytes]:
+        """같은 키로 여러 메시지의 MACt를 한 번에 계산합니다."""
+        mac = self.mac
+        return [mac(msg)[1::2] for msg in msgs]
+
+    def verify_t(self, msg: bytes, mac_t: bytes) -> bool:
+        """MACt를 상수 시간으로 검증합니다."""
+        return hmac.compare_digest(self.mac(msg)[1::2], mac_t)
+
+
+@lru_cache(maxsize=1024)
+def cmac_for(key: bytes) -> Cmac:
+    """
+    프로세스 내내 쓰이는 고정 키(마스터 키 등)에 대한 Cmac 객체를 캐시합니다.
+    인증 세션 키나 UID별 파생 키처럼 금방 버려지는 키는 캐시를 오염시키지 않도록
+    Cmac(key)를 직접 만들고, 세션 동안은 SessionState.mac()처럼 한 객체를 재사용하세요.
+    """
+    return Cmac(key)
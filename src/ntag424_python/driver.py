@@ -1,18 +1,33 @@
 import os
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, List, Tuple, Optional
 from Crypto.Cipher import AES
-from Crypto.Hash import CMAC
-from Crypto.Util.Padding import pad
-from smartcard.System import readers
-from smartcard.CardConnection import CardConnection
+from Crypto.Util.Padding import pad, unpad
 
 from .constants import (
     NTAG424_AID, DEFAULT_KEY_BYTES, 
     CMD_AUTH_EV2_FIRST_PART1, CMD_AUTH_EV2_FIRST_PART2,
-    CMD_CHANGE_FILE_SETTINGS, CMD_WRITE_DATA,
+    CMD_CHANGE_FILE_SETTINGS, CMD_WRITE_DATA, CMD_READ_SIG, CMD_GET_CARD_UID,
+    PCSC_GET_UID_APDU,
     SW_SUCCESS, SW_ADDITIONAL_FRAME
 )
+from .crypto import Cmac, compare
 from .exceptions import ConnectionError, AuthenticationError, CommandError
+from .session import UID_LENGTH, SessionState
+
+if TYPE_CHECKING:
+    from smartcard.CardConnection import CardConnection
+
+
+def _list_readers() -> list:
+    """pyscard는 리더기를 실제로 사용할 때 처음 import합니다."""
+    try:
+        from smartcard.System import readers
+    except ImportError as e:
+        raise ConnectionError(
+            "리더기 사용에는 pyscard가 필요합니다 (pip install pyscard)."
+        ) from e
+    return readers()
+
 
 class NTAG424Driver:
     """
@@ -20,24 +35,26 @@ class NTAG424Driver:
     PC/SC를 사용하여 ISO7816 통신 및 EV2 보안 메시징을 처리합니다.
     """
 
+    __slots__ = ("connection", "reader", "session")
+
     def __init__(self):
-        self.connection: Optional[CardConnection] = None
+        self.connection: Optional["CardConnection"] = None
         self.reader = None
-        self.session_enc_key: Optional[bytes] = None
-        self.session_mac_key: Optional[bytes] = None
-        self.ti: Optional[bytes] = None  # 트랜잭션 식별자 (Transaction Identifier)
-        self.cmd_ctr: int = 0
+        # 세션 상태(TI, CmdCtr, 세션 키)는 연결과 분리하여 보관합니다.
+        self.session = SessionState()
 
     def connect(self) -> bool:
         """사용 가능한 첫 번째 스마트 카드 리더기에 연결합니다."""
         try:
-            r_list = readers()
+            r_list = _list_readers()
             if not r_list:
                 return False
             self.reader = r_list[0]
             self.connection = self.reader.createConnection()
             self.connection.connect()
             return True
+        except ConnectionError:
+            raise
         except Exception:
             return False
 
@@ -48,6 +65,7 @@ class NTAG424Driver:
                 self.connection.disconnect()
             except Exception:
                 pass
+        self.session.reset()
 
     def select_app(self) -> bool:
         """NTAG 424 DNA 애플리케이션을 선택합니다."""
@@ -63,9 +81,12 @@ class NTAG424Driver:
         """
         'AuthenticateEV2First' 핸드셰이크를 수행합니다.
         성공 시 세션 키(Enc, Mac)를 파생합니다.
+        태그는 새 인증을 시작하면 이전 인증을 버리므로, 실패하면 세션은
+        인증되지 않은 상태로 남습니다.
         """
         if not self.connection:
             raise ConnectionError("연결되지 않았습니다.")
+        self.session.reset()
 
         # 1단계: 태그로부터 RndB 수신
         apdu_part1 = [0x90, CMD_AUTH_EV2_FIRST_PART1, 0x00, 0x00, 0x02, key_no, 0x00, 0x00]
@@ -95,8 +116,8 @@ class NTAG424Driver:
             cipher_dec2 = AES.new(key, AES.MODE_CBC, bytes(16))
             dec_data = cipher_dec2.decrypt(enc_data)
             
-            self.ti = dec_data[0:4]
-            self.cmd_ctr = 0
+            self.session.ti = dec_data[0:4]
+            self.session.cmd_ctr = 0
 
             # 세션 키 파생
             xor_part = bytes([a ^ b for a, b in zip(rnd_a[2:8], rnd_b[0:6])])
@@ -105,37 +126,101 @@ class NTAG424Driver:
             sv1 = bytes.fromhex("A55A00010080") + context
             sv2 = bytes.fromhex("5AA500010080") + context
             
-            cmac_enc = CMAC.new(key, ciphermod=AES)
-            cmac_enc.update(sv1)
-            self.session_enc_key = cmac_enc.digest()
-            
-            cmac_mac = CMAC.new(key, ciphermod=AES)
-            cmac_mac.update(sv2)
-            self.session_mac_key = cmac_mac.digest()
+            self.session.enc_key, self.session.mac_key = Cmac(key).mac_many([sv1, sv2])
             return True
         return False
 
     def _encrypt_packet(self, cmd_header: bytes, data: bytes) -> bytes:
         """EV2 보안 메시징을 위해 명령어 데이터를 암호화합니다."""
-        iv_input = bytes.fromhex("A55A") + self.ti + self.cmd_ctr.to_bytes(2, 'little') + bytes(8)
-        cipher_iv = AES.new(self.session_enc_key, AES.MODE_ECB)
+        ctr = self.session.cmd_ctr.to_bytes(2, 'little')
+        iv_input = bytes.fromhex("A55A") + self.session.ti + ctr + bytes(8)
+        cipher_iv = AES.new(self.session.enc_key, AES.MODE_ECB)
         iv = cipher_iv.encrypt(iv_input)
 
-        cipher_data = AES.new(self.session_enc_key, AES.MODE_CBC, iv)
+        cipher_data = AES.new(self.session.enc_key, AES.MODE_CBC, iv)
         padded_data = pad(data, 16, style='iso7816')
         return cipher_data.encrypt(padded_data)
 
     def _calc_mac(self, cmd_code: int, cmd_header: bytes, enc_data: bytes) -> bytes:
         """명령어에 대한 CMAC을 계산합니다."""
-        mac_input = bytes([cmd_code]) + self.cmd_ctr.to_bytes(2, 'little') + self.ti + cmd_header + enc_data
-        cmac_obj = CMAC.new(self.session_mac_key, ciphermod=AES)
-        cmac_obj.update(mac_input)
-        full_mac = cmac_obj.digest()
-        return full_mac[1::2] # 8바이트로 자름
+        ctr = self.session.cmd_ctr.to_bytes(2, 'little')
+        mac_input = bytes([cmd_code]) + ctr + self.session.ti + cmd_header + enc_data
+        return self.session.mac().mac_t(mac_input) # 8바이트로 자름
+
+    def _decrypt_response(self, enc_data: bytes) -> bytes:
+        """CommMode.Full 응답 데이터를 복호화합니다 (IV는 증가된 CmdCtr 기준)."""
+        ctr = self.session.cmd_ctr.to_bytes(2, 'little')
+        iv_input = bytes.fromhex("5AA5") + self.session.ti + ctr + bytes(8)
+        cipher_iv = AES.new(self.session.enc_key, AES.MODE_ECB)
+        iv = cipher_iv.encrypt(iv_input)
+
+        cipher_data = AES.new(self.session.enc_key, AES.MODE_CBC, iv)
+        return unpad(cipher_data.decrypt(enc_data), 16, style='iso7816')
+
+    def _transmit_full(self, cmd_code: int, cmd_header: bytes = b"") -> bytes:
+        """
+        명령 데이터가 없는 CommMode.Full 명령을 전송하고 복호화된 응답을 반환합니다.
+        응답 MAC = MACt(RC || CmdCtr+1 || TI || EncResponse)
+        """
+        mac = self._calc_mac(cmd_code, cmd_header, b"")
+        full_data = list(cmd_header) + list(mac)
+        apdu = [0x90, cmd_code, 0x00, 0x00, len(full_data)] + full_data + [0x00]
+
+        resp, sw1, sw2 = self.connection.transmit(apdu)
+        self.session.cmd_ctr += 1
+
+        if sw1 != SW_ADDITIONAL_FRAME or sw2 != 0x00:
+            raise CommandError(f"명령 {cmd_code:02X} 실패: SW={sw1:02X}{sw2:02X}")
+
+        resp = bytes(resp)
+        enc_data, resp_mac = resp[:-8], resp[-8:]
+        if not compare(self._calc_mac(sw2, b"", enc_data), resp_mac):
+            raise CommandError("응답 MAC 검증 실패")
+        return self._decrypt_response(enc_data)
+
+    def read_sig(self) -> bytes:
+        """
+        Read_Sig 명령어로 NXP 원본성 서명(56 bytes, secp224r1 r||s)을 읽습니다.
+        인증된 세션이 있으면 CommMode.Full로, 없으면 Plain으로 전송합니다.
+        """
+        if not self.connection:
+            raise ConnectionError("연결되지 않았습니다.")
+
+        if self.session.is_authenticated:
+            return self._transmit_full(CMD_READ_SIG, bytes([0x00]))[:56]
+
+        apdu = [0x90, CMD_READ_SIG, 0x00, 0x00, 0x01, 0x00, 0x00]
+        resp, sw1, sw2 = self.connection.transmit(apdu)
+        if sw1 != SW_ADDITIONAL_FRAME or sw2 != 0x00:
+            raise CommandError(f"Read_Sig 실패: SW={sw1:02X}{sw2:02X}")
+        return bytes(resp[:56])
+
+    def get_card_uid(self) -> bytes:
+        """
+        GetCardUID 명령어로 실제 UID(7 bytes)를 읽습니다 (CommMode.Full).
+        Random ID가 켜진 태그는 충돌 방지 단계의 UID가 매번 바뀌므로
+        이 값을 사용해야 합니다.
+        어떤 키로든 인증된 세션이 필요합니다.
+        """
+        if not self.session.is_authenticated:
+            raise AuthenticationError("세션이 인증되지 않았습니다.")
+        return self._transmit_full(CMD_GET_CARD_UID)[:UID_LENGTH]
+
+    def reader_uid(self) -> Optional[bytes]:
+        """
+        리더기가 충돌 방지 단계에서 받은 UID를 PC/SC GET DATA로 읽습니다.
+        리더기가 지원하지 않으면 None을 반환합니다 (Random ID면 4바이트 임시 값).
+        """
+        if not self.connection:
+            raise ConnectionError("연결되지 않았습니다.")
+        resp, sw1, sw2 = self.connection.transmit(PCSC_GET_UID_APDU)
+        if sw1 != SW_SUCCESS or sw2 != 0x00:
+            return None
+        return bytes(resp)
 
     def change_file_settings(self, file_no: int, access_rights: bytes, change_params: bytes) -> bool:
         """ChangeFileSettings 명령어를 전송합니다 (암호화 + MAC 적용)."""
-        if not self.session_enc_key:
+        if not self.session.is_authenticated:
             raise AuthenticationError("세션이 인증되지 않았습니다.")
 
         cmd_header = bytes([file_no])
@@ -149,13 +234,13 @@ class NTAG424Driver:
         apdu = [0x90, CMD_CHANGE_FILE_SETTINGS, 0x00, 0x00, len(full_data)] + full_data + [0x00]
         
         resp, sw1, sw2 = self.connection.transmit(apdu)
-        self.cmd_ctr += 1
+        self.session.cmd_ctr += 1
         
         return sw1 == SW_ADDITIONAL_FRAME and sw2 == 0x00
 
     def write_data_plain(self, file_no: int, data: bytes, offset: int = 0) -> bool:
         """WriteData 명령어를 전송합니다 (Standard Mode, EV2 MAC 포함)."""
-        if not self.session_enc_key:
+        if not self.session.is_authenticated:
              raise AuthenticationError("세션이 인증되지 않았습니다.")
 
         cmd_header = bytes([file_no]) + offset.to_bytes(3, 'little') + len(data).to_bytes(3, 'little')
@@ -170,6 +255,6 @@ class NTAG424Driver:
         apdu = [0x90, CMD_WRITE_DATA, 0x00, 0x00, len(full_data)] + full_data + [0x00]
 
         resp, sw1, sw2 = self.connection.transmit(apdu)
-        self.cmd_ctr += 1
+        self.session.cmd_ctr += 1
         
         return sw1 == SW_ADDITIONAL_FRAME and sw2 == 0x00
\ No newline at end of file
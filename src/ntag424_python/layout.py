@@ -0,0 +1,255 @@
+"""
+NDEF 파일 레이아웃 및 SUN URL 템플릿.
+
+태그에 기록할 NDEF 파일(Type 4 Tag)과 SDM 미러링 오프셋을 계산하고,
+서버 측에서 URL로부터 같은 파일 내용을 재구성합니다. pyscard를 import하지 않습니다.
+"""
+
+from typing import List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# [File Length (2bytes)] + [NDEF Header (5bytes)] + [Payload (URL...)]
+NDEF_FILE_HEADER_LEN = 2
+NDEF_RECORD_HEADER_LEN = 5
+NDEF_HEADER_LEN = NDEF_FILE_HEADER_LEN + NDEF_RECORD_HEADER_LEN
+
+ENC_PARAM = "enc="
+DATA_PARAM = "&data="
+CMAC_PARAM = "&cmac="
+PICC_DATA_HEX_LEN = 32
+CMAC_HEX_LEN = 16
+
+# SDMOptions 비트 (NT4H2421Gx Table 69)
+SDM_OPT_UID = 0x80
+SDM_OPT_READ_CTR = 0x40
+SDM_OPT_READ_CTR_LIMIT = 0x20
+SDM_OPT_ENC_FILE_DATA = 0x10
+SDM_OPT_ASCII = 0x01
+
+# SDMAccessRights 값
+SDM_ACCESS_PLAIN = 0xE
+SDM_ACCESS_NONE = 0xF
+
+
+def _check_enc_file_data(
+    options: int,
+    mac_input_offset: int,
+    enc_offset: int,
+    enc_length: Optional[int],
+    mac_offset: int,
+) -> int:
+    """SDMENCFileData 설정을 검증하고 enc_length를 반환합니다."""
+    if enc_length is None or enc_length % 32:
+        raise ValueError("SDMENCFileData에는 32의 배수인 enc_length가 필요합니다.")
+    if options & (SDM_OPT_UID | SDM_OPT_READ_CTR) != SDM_OPT_UID | SDM_OPT_READ_CTR:
+        raise ValueError("SDMENCFileData는 UID와 SDMReadCtr 미러링이 모두 필요합니다.")
+    if not enc_offset + enc_length <= mac_offset:
+        raise ValueError("SDMMACOffset은 SDMENC 영역 뒤에 있어야 합니다.")
+    if mac_input_offset > enc_offset:
+        raise ValueError("SDMMAC 입력이 SDMENCFileData 전체를 포함해야 합니다.")
+    return enc_length
+
+
+def build_sdm_params(
+    meta_read: int,
+    file_read: int,
+    ctr_ret: int,
+    uid_offset: Optional[int] = None,
+    read_ctr_offset: Optional[int] = None,
+    picc_data_offset: Optional[int] = None,
+    mac_input_offset: Optional[int] = None,
+    enc_offset: Optional[int] = None,
+    enc_length: Optional[int] = None,
+    mac_offset: Optional[int] = None,
+    read_ctr_limit: Optional[int] = None,
+) -> bytes:
+    """
+    ChangeFileSettings의 SDM 부분(SDMOptions 이후)을 조립합니다.
+
+    필드 순서: SDMOptions, SDMAccessRights, [UIDOffset], [SDMReadCtrOffset],
+    [PICCDataOffset], [SDMMACInputOffset], [SDMENCOffset], [SDMENCLength],
+    [SDMMACOffset], [SDMReadCtrLimit] (각 오프셋은 3바이트 LSB first).
+    SDMOptions의 UID/ReadCtr/ENCFileData/ReadCtrLimit 비트는
+    주어진 오프셋으로 정해집니다.
+
+    Args:
+        meta_read (int): SDMMetaRead 권한 (0~4: 암호화 PICCData, E: 평문, F: 없음)
+        file_read (int): SDMFileRead 권한 (0~4: SDMMAC/SDMENC 키, F: 없음)
+        ctr_ret (int): SDMCtrRet 권한
+    """
+    plain_meta = meta_read == SDM_ACCESS_PLAIN
+    enc_meta = meta_read <= 4
+    with_file_read = file_read != SDM_ACCESS_NONE
+
+    if not plain_meta and (uid_offset is not None or read_ctr_offset is not None):
+        raise ValueError(
+            "UIDOffset/SDMReadCtrOffset은 SDMMetaRead가 E(평문)일 때만 사용합니다."
+        )
+
+    options = SDM_OPT_ASCII
+    if uid_offset is not None or enc_meta:
+        options |= SDM_OPT_UID
+    if read_ctr_offset is not None or enc_meta:
+        options |= SDM_OPT_READ_CTR
+    if enc_offset is not None:
+        options |= SDM_OPT_ENC_FILE_DATA
+    if read_ctr_limit is not None:
+        options |= SDM_OPT_READ_CTR_LIMIT
+
+    access = (meta_read << 12) | (file_read << 8) | (0xF << 4) | ctr_ret
+    params = bytes([options]) + access.to_bytes(2, 'little')
+
+    fields: List[int] = []
+    if uid_offset is not None:
+        fields.append(uid_offset)
+    if read_ctr_offset is not None:
+        fields.append(read_ctr_offset)
+    if enc_meta:
+        if picc_data_offset is None:
+            raise ValueError(
+                "암호화 PICCData 미러링에는 picc_data_offset이 필요합니다."
+            )
+        fields.append(picc_data_offset)
+    if with_file_read:
+        if mac_input_offset is None or mac_offset is None:
+            raise ValueError(
+                "SDMFileRead 키 사용 시 mac_input_offset, mac_offset이 필요합니다."
+            )
+        fields.append(mac_input_offset)
+        if enc_offset is not None:
+            enc_length = _check_enc_file_data(
+                options, mac_input_offset, enc_offset, enc_length, mac_offset
+            )
+            fields += [enc_offset, enc_length]
+        fields.append(mac_offset)
+    elif enc_offset is not None:
+        raise ValueError("SDMENCFileData에는 SDMFileRead 키가 필요합니다.")
+    if read_ctr_limit is not None:
+        fields.append(read_ctr_limit)
+    return params + b"".join(f.to_bytes(3, 'little') for f in fields)
+
+
+class SdmLayout(NamedTuple):
+    """calculate_layout이 계산한 URL 템플릿과 파일 내 미러링 위치."""
+
+    url: str
+    picc_data_offset: int
+    enc_offset: int
+    enc_length: int  # ASCII 기준 길이, 0이면 SDMENCFileData 미사용
+    cmac_offset: int
+
+    def sdm_params(
+        self, meta_read: int, file_read: int, ctr_ret: int, mac_input_offset: int = 0
+    ) -> bytes:
+        """이 레이아웃에 맞는 ChangeFileSettings SDM 파라미터를 만듭니다."""
+        return build_sdm_params(
+            meta_read, file_read, ctr_ret,
+            picc_data_offset=self.picc_data_offset,
+            mac_input_offset=mac_input_offset,
+            enc_offset=self.enc_offset if self.enc_length else None,
+            enc_length=self.enc_length or None,
+            mac_offset=self.cmac_offset,
+        )
+
+    def file_data(self, plaintext: bytes = b"") -> bytes:
+        """
+        태그에 기록할 NDEF 파일 내용.
+        plaintext는 SDMENC 자리의 앞 절반에 그대로 기록되고 나머지 절반은 무시됩니다.
+        """
+        if len(plaintext) != self.enc_length // 2:
+            raise ValueError(f"평문 길이는 {self.enc_length // 2}바이트여야 합니다.")
+        file_data = bytearray(build_ndef_file(self.url))
+        file_data[self.enc_offset:self.enc_offset + len(plaintext)] = plaintext
+        return bytes(file_data)
+
+
+def calculate_layout(base_url: str, enc_data_len: int = 0) -> SdmLayout:
+    """
+    URL 길이와 NDEF 헤더를 고려하여 암호화 데이터가 들어갈 위치(Offset)를 계산합니다.
+
+    URL 형식: {base_url}?enc=<PICCData 32>[&data=<SDMENCFileData>]&cmac=<SDMMAC 16>
+
+    Args:
+        enc_data_len (int): SDMENCFileData로 미러링할 평문 길이
+            (16의 배수, 0이면 사용 안 함)
+    """
+    if enc_data_len % 16:
+        raise ValueError("SDMENCFileData 평문 길이는 16의 배수여야 합니다.")
+
+    # 1. 구분자 결정 (? 또는 &)
+    separator = "&" if "?" in base_url else "?"
+
+    # 2. 실제 URL 데이터는 파일의 7번째 바이트(인덱스 7)부터 시작됩니다.
+    # 3. PICC Data Offset: [헤더 7바이트] + [URL] + [? 또는 &] + [enc=]
+    picc_data_offset = NDEF_HEADER_LEN + len(base_url) + len(separator) + len(ENC_PARAM)
+    url = f"{base_url}{separator}{ENC_PARAM}{'0' * PICC_DATA_HEX_LEN}"
+    end = picc_data_offset + PICC_DATA_HEX_LEN
+
+    # 4. SDMENCFileData Offset: PICCData 뒤 "&data=" (ASCII이므로 평문 길이의 2배)
+    enc_offset = 0
+    enc_length = 2 * enc_data_len
+    if enc_length:
+        enc_offset = end + len(DATA_PARAM)
+        url += f"{DATA_PARAM}{'0' * enc_length}"
+        end = enc_offset + enc_length
+
+    # 5. CMAC Offset: 앞 데이터 끝 + "&cmac=" 길이
+    cmac_offset = end + len(CMAC_PARAM)
+    url += f"{CMAC_PARAM}{'0' * CMAC_HEX_LEN}"
+    return SdmLayout(url, picc_data_offset, enc_offset, enc_length, cmac_offset)
+
+
+def calculate_offsets(base_url: str) -> Tuple[str, int, int]:
+    """
+    PICCData + CMAC만 미러링하는 기본 레이아웃을 계산합니다.
+
+    Returns:
+        (전체 URL 템플릿, PICCData 오프셋, CMAC 오프셋)
+    """
+    layout = calculate_layout(base_url)
+    return layout.url, layout.picc_data_offset, layout.cmac_offset
+
+
+def build_ndef_file(url: str) -> bytes:
+    """
+    URI 레코드 하나로 된 NDEF 파일 내용을 만듭니다.
+
+    구조: [Length(2, BE)] + [D1 01 PLen 55 00] + URL
+    """
+    url_bytes = url.encode('ascii')
+    if len(url_bytes) + 1 > 0xFF:
+        raise ValueError("URL이 너무 깁니다 (Short Record는 255바이트까지).")
+    # Payload Length: URL길이 + 1 (Prefix 0x00 포함)
+    ndef_record_header = bytes([0xD1, 0x01, len(url_bytes) + 1, 0x55, 0x00])
+    ndef_message = ndef_record_header + url_bytes
+    return len(ndef_message).to_bytes(2, 'big') + ndef_message
+
+
+def parse_sun_url(url: str) -> Tuple[bytes, bytes]:
+    """태그가 미러링한 URL에서 (enc, cmac) 값을 꺼냅니다."""
+    query = parse_qs(urlsplit(url).query)
+    try:
+        enc = bytes.fromhex(query["enc"][-1])
+        cmac = bytes.fromhex(query["cmac"][-1])
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"SUN 파라미터가 없거나 잘못되었습니다: {url}") from e
+    return enc, cmac
+
+
+def parse_file_data(url: str) -> bytes:
+    """URL의 data 값(SDMENCFileData 암호문)을 꺼냅니다. 없으면 빈 바이트열."""
+    values = parse_qs(urlsplit(url).query).get(DATA_PARAM.strip("&="))
+    try:
+        return bytes.fromhex(values[-1]) if values else b""
+    except ValueError as e:
+        raise ValueError(f"data 파라미터가 잘못되었습니다: {url}") from e
+
+
+def mac_input_from_url(url: str, mac_input_offset: int = 0) -> bytes:
+    """
+    URL로부터 DynamicFileData[SDMMACInputOffset:SDMMACOffset]를 재구성합니다.
+
+    SDMMACOffset은 URL 안의 "cmac=" 값 시작 위치로 계산합니다.
+    """
+    mac_offset = NDEF_HEADER_LEN + url.rindex(CMAC_PARAM) + len(CMAC_PARAM)
+    return build_ndef_file(url)[mac_input_offset:mac_offset]
@@ -0,0 +1,346 @@
+"""
+검증 서버 용량 산정을 위한 합성 SUN URL 생성기 및 부하 테스트 하네스.
+
+태그와 같은 SDM 암호화(PICCData 암호화 + SDMMAC)로 calculate_offsets 레이아웃의
+URL을 만들어 냅니다. 종류는 정상(VALID), 재사용(REPLAYED), 변조(TAMPERED),
+잘못된 키(WRONG_KEY) 네 가지이며, 파일로 기록하거나 인프로세스/루프백 HTTP
+검증기로 바로 흘려보내고 처리량과 지연 백분위를 보고합니다.
+"""
+
+import queue
+import random
+import threading
+import time
+from enum import Enum
+from http.server import ThreadingHTTPServer
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from urllib.error import HTTPError
+from urllib.parse import quote, urlsplit
+from urllib.request import urlopen
+
+from Crypto.Cipher import AES
+
+from ._http import QuietHandler, serve_in_background
+from .layout import (
+    NDEF_HEADER_LEN,
+    PICC_DATA_HEX_LEN,
+    build_ndef_file,
+    calculate_offsets,
+    parse_sun_url,
+)
+from .sdm import calc_sdm_mac, decrypt_picc_data, derive_session_mac_key
+from .session import UID_LENGTH
+from .stats import percentile
+
+HEX_DIGITS = "0123456789ABCDEF"
+
+
+class Kind(Enum):
+    VALID = "valid"
+    REPLAYED = "replayed"
+    TAMPERED = "tampered"
+    WRONG_KEY = "wrong_key"
+
+
+DEFAULT_MIX = {
+    Kind.VALID: 0.85,
+    Kind.REPLAYED: 0.05,
+    Kind.TAMPERED: 0.05,
+    Kind.WRONG_KEY: 0.05,
+}
+
+
+class SunUrlGenerator:
+    """
+    calculate_offsets(base_url) 레이아웃의 SUN URL을 무한히 생성합니다.
+
+    URL 길이가 고정이므로 NDEF 헤더와 MAC 입력의 앞부분을 미리 만들어 두고,
+    URL 하나당 AES 블록 한 번과 CMAC 두 번(세션 키 + SDMMAC)만 계산합니다.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        meta_read_key: bytes,
+        file_read_key_for: Callable[[bytes], bytes],
+        tag_count: int = 1000,
+        mix: Optional[Dict[Kind, float]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.meta_read_key = meta_read_key
+        self.file_read_key_for = file_read_key_for
+        self._rng = random.Random(seed)
+        self._meta_cipher = AES.new(meta_read_key, AES.MODE_ECB)
+
+        template, picc_offset, cmac_offset = calculate_offsets(base_url)
+        file_data = build_ndef_file(template)
+        # enc 값 앞까지의 파일 내용, enc 값과 cmac 값 사이("&cmac="), URL 접두어
+        self._mac_prefix = file_data[:picc_offset]
+        self._mac_middle = file_data[picc_offset + PICC_DATA_HEX_LEN:cmac_offset]
+        self._url_prefix = file_data[NDEF_HEADER_LEN:picc_offset].decode()
+        self._url_middle = self._mac_middle.decode()
+
+        self.uids = [
+            bytes([0x04]) + self._rng.randbytes(UID_LENGTH - 1)
+            for _ in range(tag_count)
+        ]
+        self._counters = [self._rng.randrange(0, 1000) for _ in range(tag_count)]
+        self._file_keys: Dict[bytes, bytes] = {}
+        self._issued: List[str] = []
+
+        mix = mix or DEFAULT_MIX
+        self._kinds = list(mix)
+        self._weights = [mix[k] for k in self._kinds]
+
+    def _file_key(self, uid: bytes) -> bytes:
+        key = self._file_keys.get(uid)
+        if key is None:
+            key = self._file_keys[uid] = self.file_read_key_for(uid)
+        return key
+
+    def make_url(
+        self, uid: bytes, read_ctr: int, file_read_key: Optional[bytes] = None
+    ) -> str:
+        """태그가 해당 (UID, 카운터)로 미러링했을 URL을 만듭니다."""
+        ctr = read_ctr.to_bytes(3, 'little')
+        picc_data = bytes([0xC7]) + uid + ctr + self._rng.randbytes(5)
+        # IV가 0인 CBC 한 블록 = ECB
+        enc_hex = self._meta_cipher.encrypt(picc_data).hex().upper()
+        file_key = file_read_key or self._file_key(uid)
+        key = derive_session_mac_key(file_key, uid, read_ctr)
+        mac = calc_sdm_mac(key, self._mac_prefix + enc_hex.encode() + self._mac_middle)
+        return f"{self._url_prefix}{enc_hex}{self._url_middle}{mac.hex().upper()}"
+
+    def _next_valid(self, issue: bool = True) -> str:
+        i = self._rng.randrange(len(self.uids))
+        self._counters[i] += 1
+        url = self.make_url(self.uids[i], self._counters[i])
+        # 재사용 후보에는 실제로 내보낸 정상 URL만 넣습니다.
+        if not issue:
+            return url
+        if len(self._issued) < 4096:
+            self._issued.append(url)
+        else:
+            self._issued[self._rng.randrange(4096)] = url
+        return url
+
+    def _tamper(self, url: str) -> str:
+        # enc 또는 cmac 값 중 한 자리를 다른 16진 숫자로 바꿉니다.
+        # (대소문자만 바꾸면 같은 값)
+        start = len(self._url_prefix)
+        positions = list(range(start, start + PICC_DATA_HEX_LEN)) + list(
+            range(len(url) - 16, len(url))
+        )
+        pos = self._rng.choice(positions)
+        digit = self._rng.choice([d for d in HEX_DIGITS if d != url[pos].upper()])
+        return url[:pos] + digit + url[pos + 1:]
+
+    def next(self) -> Tuple[Kind, str]:
+        kind = self._rng.choices(self._kinds, self._weights)[0]
+        if kind is Kind.REPLAYED and self._issued:
+            return kind, self._rng.choice(self._issued)
+        if kind is Kind.TAMPERED:
+            return kind, self._tamper(self._next_valid(issue=False))
+        if kind is Kind.WRONG_KEY:
+            i = self._rng.randrange(len(self.uids))
+            self._counters[i] += 1
+            wrong_key = self._rng.randbytes(16)
+            return kind, self.make_url(self.uids[i], self._counters[i], wrong_key)
+        return Kind.VALID, self._next_valid()
+
+    def generate(self, count: int) -> Iterator[Tuple[Kind, str]]:
+        for _ in range(count):
+            yield self.next()
+
+
+def write_urls(items: Iterable[Tuple[Kind, str]], path: str) -> int:
+    """"종류<TAB>URL" 형식으로 한 줄에 하나씩 기록하고 기록한 줄 수를 반환합니다."""
+    count = 0
+    with open(path, "w", encoding="ascii") as f:
+        for kind, url in items:
+            f.write(f"{kind.value}\t{url}\n")
+            count += 1
+    return count
+
+
+def read_urls(path: str) -> Iterator[Tuple[Kind, str]]:
+    with open(path, encoding="ascii") as f:
+        for line in f:
+            kind, url = line.rstrip("\n").split("\t", 1)
+            yield Kind(kind), url
+
+
+class LoadReport(NamedTuple):
+    requests: int
+    elapsed: float
+    latencies_ms: List[float]
+    by_kind: Dict[Kind, int]
+    unexpected: int
+    errors: int
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, q: float) -> float:
+        return percentile(self.latencies_ms, q)
+
+    def summary(self) -> str:
+        kinds = ", ".join(f"{k.value}={n}" for k, n in self.by_kind.items())
+        return (
+            f"요청 {self.requests}건 / {self.elapsed:.2f}s "
+            f"= {self.throughput:.0f} req/s\n"
+            f"지연(ms) p50={self.percentile(50):.3f} p90={self.percentile(90):.3f} "
+            f"p99={self.percentile(99):.3f} max={self.percentile(100):.3f}\n"
+            f"종류별: {kinds}\n"
+            f"예상과 다른 판정 {self.unexpected}건, 오류 {self.errors}건"
+        )
+
+
+def uid_router(meta_read_key: bytes) -> Callable[[str], Hashable]:
+    """
+    run_load의 route 함수. URL의 PICCData를 복호화한 UID를 반환합니다.
+    복호화할 수 없는 URL(enc 변조 등)은 URL 자체를 반환하여 워커에 고르게 흩어집니다.
+    """
+
+    def route(url: str) -> Hashable:
+        try:
+            enc, _ = parse_sun_url(url)
+            uid, _ = decrypt_picc_data(enc, meta_read_key)
+        except ValueError:
+            return url
+        return uid or url
+
+    return route
+
+
+def run_load(
+    items: Iterable[Tuple[Kind, str]],
+    target: Callable[[str], bool],
+    rate: Optional[float] = None,
+    concurrency: int = 1,
+    route: Optional[Callable[[str], Hashable]] = None,
+) -> LoadReport:
+    """
+    URL을 target(url) -> 유효 여부 로 보내고 지연 시간을 측정합니다.
+
+    워커마다 큐를 두고 route(url)의 해시로 워커를 고릅니다. SunVerifier처럼 UID별
+    SDMReadCtr 순서에 의존하는 검증기는 같은 UID의 URL이 보낸 순서대로 처리되어야
+    하므로 concurrency > 1이면 route=uid_router(meta_read_key)를 넘겨야 합니다.
+    route가 없으면 순서대로 돌아가며 배정합니다.
+
+    Args:
+        rate: 초당 요청 수 상한 (None이면 최대 속도)
+        concurrency: 워커(동시에 처리 중인 요청) 수
+        route: URL -> 라우팅 키 (같은 키는 항상 같은 워커에서 순서대로 처리)
+    """
+    latencies: List[float] = []
+    by_kind: Dict[Kind, int] = {}
+    counts = {"unexpected": 0, "errors": 0}
+    lock = threading.Lock()
+    queues: List[queue.Queue] = [queue.Queue(maxsize=256) for _ in range(concurrency)]
+
+    def call(kind: Kind, url: str) -> None:
+        t0 = time.perf_counter()
+        try:
+            valid = target(url)
+            error = False
+        except Exception:
+            valid, error = False, True
+        elapsed = (time.perf_counter() - t0) * 1000
+        with lock:
+            latencies.append(elapsed)
+            by_kind[kind] = by_kind.get(kind, 0) + 1
+            if error:
+                counts["errors"] += 1
+            elif valid != (kind is Kind.VALID):
+                counts["unexpected"] += 1
+
+    def worker(q: queue.Queue) -> None:
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            call(*item)
+
+    threads = [threading.Thread(target=worker, args=(q,), daemon=True) for q in queues]
+    for thread in threads:
+        thread.start()
+
+    start = time.perf_counter()
+    for i, (kind, url) in enumerate(items):
+        if rate:
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        index = hash(route(url)) % concurrency if route else i % concurrency
+        queues[index].put((kind, url))
+    for q in queues:
+        q.put(None)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return LoadReport(
+        len(latencies),
+        elapsed,
+        latencies,
+        by_kind,
+        counts["unexpected"],
+        counts["errors"],
+    )
+
+
+def http_target(endpoint: str, timeout: float = 5.0) -> Callable[[str], bool]:
+    """
+    루프백 검증 서버로 보내는 target. 태그 URL의 경로+쿼리를 endpoint에 붙여 GET합니다.
+    200이면 유효, 403이면 무효로 봅니다.
+    """
+    endpoint = endpoint.rstrip("/")
+
+    def target(url: str) -> bool:
+        parts = urlsplit(url)
+        try:
+            request_url = f"{endpoint}{quote(parts.path)}?{parts.query}"
+            with urlopen(request_url, timeout=timeout) as resp:
+                status: int = resp.status
+                return status == 200
+        except HTTPError as e:
+            if e.code == 403:
+                return False
+            raise
+
+    return target
+
+
+def serve_verifier(
+    verify: Callable[[str], bool], origin: str, host: str = "127.0.0.1", port: int = 0
+) -> ThreadingHTTPServer:
+    """
+    verify(url)를 감싼 루프백 HTTP 검증 서버를 백그라운드 스레드로 띄웁니다.
+    요청 경로를 origin(예: https://challenge.walkd.co.kr)에 붙여 원래 URL을 복원합니다.
+    """
+    origin = origin.rstrip("/")
+
+    class Handler(QuietHandler):
+        def do_GET(self) -> None:
+            try:
+                valid = verify(origin + self.path)
+            except ValueError:
+                valid = False
+            self.send_response(200 if valid else 403)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    return serve_in_background(Handler, host, port)
+
@@ -0,0 +1,435 @@
+"""
+프로비저닝 라인 모니터링 지표와 처리량 조절기.
+
+무인으로 main.py를 돌리는 스테이션이 분당 처리 태그 수, 단계별 지연
+(select/auth/settings/write/key change), 실패 유형, 리더기별 가동률을 기록합니다.
+최근 구간 데이터는 모두 고정 크기 링 버퍼에 보관하므로 오래 돌려도 메모리가
+늘지 않습니다.
+serve_metrics()로 로컬 HTTP 엔드포인트(JSON)를 띄우면 감독자가 실시간으로 확인하고
+Regulator의 한계값을 조정할 수 있습니다.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import parse_qs, urlsplit
+
+from ._http import QuietHandler, serve_in_background
+from .session import UID_LENGTH, Step, TagResult
+from .stats import percentile
+
+DEFAULT_WINDOW = 60.0
+DEFAULT_CAPACITY = 1024
+
+
+class RingBuffer:
+    """용량이 고정된 링 버퍼. 가득 차면 가장 오래된 항목을 덮어씁니다."""
+
+    __slots__ = ("_items", "_next", "_size")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity는 1 이상이어야 합니다.")
+        self._items: list = [None] * capacity
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._items)
+
+    def append(self, item: Any) -> None:
+        self._items[self._next] = item
+        self._next = (self._next + 1) % len(self._items)
+        if self._size < len(self._items):
+            self._size += 1
+
+    def __iter__(self) -> Iterator:
+        """오래된 항목부터 순서대로 순회합니다."""
+        capacity = len(self._items)
+        start = (self._next - self._size) % capacity
+        for i in range(self._size):
+            yield self._items[(start + i) % capacity]
+
+
+class TagRun:
+    """
+    태그 한 개의 처리 과정. StationMetrics.begin()으로 만듭니다.
+
+    uid는 호출자가 알아낸 뒤 채웁니다. 채우지 않으면 0으로 채운 UID가 기록됩니다.
+    """
+
+    __slots__ = ("_metrics", "reader", "started", "uid")
+
+    def __init__(
+        self, metrics: "StationMetrics", reader: str, started: Optional[float] = None
+    ):
+        self._metrics = metrics
+        self.reader = reader
+        self.started = metrics.clock() if started is None else started
+        self.uid = bytes(UID_LENGTH)
+
+    @contextmanager
+    def step(self, step: Step) -> Iterator[None]:
+        """with 블록의 소요 시간을 해당 단계의 지연으로 기록합니다."""
+        t0 = self._metrics.clock()
+        try:
+            yield
+        finally:
+            elapsed = self._metrics.clock() - t0
+            self._metrics.record_step(self.reader, step, elapsed)
+
+    def finish(
+        self, failed_step: Step = Step.NONE, error: Optional[BaseException] = None
+    ) -> TagResult:
+        """
+        처리를 끝내고 결과를 기록합니다.
+        failed_step이 NONE이고 error도 없으면 성공으로 봅니다.
+        """
+        ok = failed_step is Step.NONE and error is None
+        result = TagResult(self.uid, ok, failed_step, time.time())
+        failure = None
+        if error is not None:
+            failure = f"exception:{type(error).__name__}"
+        elif not ok:
+            failure = failed_step.name.lower()
+        ended = self._metrics.clock()
+        self._metrics.record_tag(self.reader, result, self.started, ended, failure)
+        return result
+
+
+class _ReaderStats:
+    __slots__ = ("busy", "outcomes")
+
+    def __init__(self, capacity: int):
+        self.busy = RingBuffer(capacity)  # (시작, 종료)
+        self.outcomes = RingBuffer(capacity)  # (종료 시각, 성공 여부)
+
+
+class StationMetrics:
+    """
+    스테이션 지표 수집기. 여러 리더기 스레드에서 동시에 기록해도 됩니다.
+
+    Args:
+        capacity: 각 링 버퍼의 크기 (단계별 지연, 리더기별 처리 기록)
+        window: 분당 처리량/가동률/실패율을 계산하는 최근 구간(초)
+        clock: 단조 시계 (테스트에서 주입)
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        window: float = DEFAULT_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.window = window
+        self.clock = clock
+        self.started = clock()
+        self._lock = threading.Lock()
+        self._steps: Dict[Step, RingBuffer] = {}
+        self._readers: Dict[str, _ReaderStats] = {}
+        self._failures: Dict[str, int] = {}
+        self._totals = {"ok": 0, "failed": 0}
+
+    def begin(self, reader: str, started: Optional[float] = None) -> TagRun:
+        """
+        태그 처리를 시작합니다.
+        started는 연결 시도 시각처럼 이미 지난 시작 시각(clock 기준)입니다.
+        """
+        return TagRun(self, reader, started)
+
+    def _reader(self, reader: str) -> _ReaderStats:
+        stats = self._readers.get(reader)
+        if stats is None:
+            stats = self._readers[reader] = _ReaderStats(self.capacity)
+        return stats
+
+    def record_step(self, reader: str, step: Step, seconds: float) -> None:
+        with self._lock:
+            buf = self._steps.get(step)
+            if buf is None:
+                buf = self._steps[step] = RingBuffer(self.capacity)
+            buf.append(seconds)
+            self._reader(reader)
+
+    def record_tag(
+        self,
+        reader: str,
+        result: TagResult,
+        started: float,
+        ended: float,
+        failure: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            stats = self._reader(reader)
+            stats.busy.append((started, ended))
+            stats.outcomes.append((ended, result.ok))
+            self._totals["ok" if result.ok else "failed"] += 1
+            if failure:
+                self._failures[failure] = self._failures.get(failure, 0) + 1
+
+    def recent_outcomes(self, reader: str) -> List[bool]:
+        """최근 window 동안 reader가 끝낸 태그들의 성공 여부 (오래된 것부터)."""
+        return self.recent_window(reader)[0]
+
+    def recent_window(self, reader: str) -> Tuple[List[bool], Optional[float]]:
+        """최근 window의 성공 여부 목록과 가장 최근 종료 시각 (기록이 없으면 None)."""
+        since = self.clock() - self.window
+        with self._lock:
+            stats = self._readers.get(reader)
+            if stats is None:
+                return [], None
+            recent = [(ended, ok) for ended, ok in stats.outcomes if ended >= since]
+        return [ok for _, ok in recent], recent[-1][0] if recent else None
+
+    def tags_per_minute(self, reader: Optional[str] = None) -> float:
+        """
+        최근 window 동안 성공한 태그 수를 분당 값으로 환산합니다.
+        reader가 없으면 전체 리더기 합계입니다.
+        """
+        window = min(self.window, self.clock() - self.started) or self.window
+        with self._lock:
+            readers = [reader] if reader is not None else list(self._readers)
+        done = sum(sum(self.recent_outcomes(r)) for r in readers)
+        return done * 60.0 / window
+
+    def failure_rate(self, reader: str) -> Optional[float]:
+        """최근 window 동안의 실패 비율. 기록이 없으면 None."""
+        outcomes = self.recent_outcomes(reader)
+        if not outcomes:
+            return None
+        return 1.0 - sum(outcomes) / len(outcomes)
+
+    def utilization(self, reader: str) -> float:
+        """최근 window 중 리더기가 태그를 처리하고 있던 시간의 비율 (0~1)."""
+        now = self.clock()
+        since = now - self.window
+        with self._lock:
+            stats = self._readers.get(reader)
+            intervals = list(stats.busy) if stats else []
+        busy: float = sum(
+            max(0.0, end - max(start, since)) for start, end in intervals if end > since
+        )
+        return min(1.0, busy / (min(self.window, now - self.started) or self.window))
+
+    def snapshot(self) -> dict:
+        """JSON으로 내보낼 현재 지표 (지연은 밀리초)."""
+        with self._lock:
+            steps = {step: list(buf) for step, buf in self._steps.items()}
+            readers = list(self._readers)
+            failures = dict(self._failures)
+            totals = dict(self._totals)
+        return {
+            "uptime_s": round(self.clock() - self.started, 3),
+            "window_s": self.window,
+            "tags_per_minute": round(self.tags_per_minute(), 2),
+            "totals": totals,
+            "failures": failures,
+            "steps": {
+                step.name.lower(): {
+                    "count": len(values),
+                    "p50_ms": round(percentile(values, 50) * 1000, 3),
+                    "p95_ms": round(percentile(values, 95) * 1000, 3),
+                    "max_ms": round(max(values) * 1000, 3),
+                }
+                for step, values in sorted(steps.items())
+                if values
+            },
+            "readers": {
+                reader: {
+                    "tags_per_minute": round(self.tags_per_minute(reader), 2),
+                    "utilization": round(self.utilization(reader), 3),
+                    "failure_rate": self.failure_rate(reader),
+                }
+                for reader in readers
+            },
+        }
+
+
+class Pacing(NamedTuple):
+    """리더기 하나에 대한 현재 조절 값."""
+
+    concurrency: int
+    retry_delay: float
+
+
+class Regulator:
+    """
+    최근 실패율로 리더기별 동시 처리 수와 재시도 간격을 조절합니다 (AIMD).
+
+    실패율이 target_failure_rate를 넘으면 동시 처리 수를 절반으로 줄이고 재시도 간격을
+    두 배로 늘리며, 그렇지 않으면 동시 처리 수를 1씩 늘리고 간격을 절반으로 줄입니다.
+    기록이 min_samples개 미만이거나 지난 update() 이후 새 기록이 없으면 값을 바꾸지
+    않습니다. 한계값은 tune()으로 실시간 조정합니다.
+    """
+
+    TUNABLE = (
+        "min_concurrency", "max_concurrency", "base_delay", "max_delay",
+        "target_failure_rate", "min_samples",
+    )
+
+    def __init__(
+        self,
+        metrics: StationMetrics,
+        min_concurrency: int = 1,
+        max_concurrency: int = 4,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        target_failure_rate: float = 0.1,
+        min_samples: int = 5,
+    ):
+        self._check_limits({
+            "min_concurrency": min_concurrency,
+            "max_concurrency": max_concurrency,
+            "base_delay": base_delay,
+            "max_delay": max_delay,
+            "target_failure_rate": target_failure_rate,
+            "min_samples": min_samples,
+        })
+        self.metrics = metrics
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.target_failure_rate = target_failure_rate
+        self.min_samples = min_samples
+        self._pacing: Dict[str, Pacing] = {}
+        # 리더기별로 마지막으로 반영한 (표본 수, 최근 종료 시각)
+        self._seen: Dict[str, Tuple[int, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def pacing(self, reader: str) -> Pacing:
+        with self._lock:
+            pacing = self._pacing.get(reader)
+            return self._clamp(pacing or Pacing(self.min_concurrency, self.base_delay))
+
+    def _clamp(self, pacing: Pacing) -> Pacing:
+        concurrency = max(
+            self.min_concurrency, min(self.max_concurrency, pacing.concurrency)
+        )
+        delay = max(self.base_delay, min(self.max_delay, pacing.retry_delay))
+        return Pacing(concurrency, delay)
+
+    def update(self, reader: str) -> Pacing:
+        """
+        태그 하나를 끝낼 때마다 호출하여 새 조절 값을 계산합니다.
+        같은 기록으로 여러 번 호출해도 한 번만 반영합니다.
+        """
+        outcomes, last_ended = self.metrics.recent_window(reader)
+        seen = (len(outcomes), last_ended)
+        with self._lock:
+            default = Pacing(self.min_concurrency, self.base_delay)
+            current = self._clamp(self._pacing.get(reader) or default)
+            if (
+                not outcomes
+                or len(outcomes) < self.min_samples
+                or self._seen.get(reader) == seen
+            ):
+                return current
+            self._seen[reader] = seen
+
+            rate = 1.0 - sum(outcomes) / len(outcomes)
+            if rate > self.target_failure_rate:
+                pacing = Pacing(current.concurrency // 2, current.retry_delay * 2)
+            else:
+                pacing = Pacing(current.concurrency + 1, current.retry_delay / 2)
+            pacing = self._pacing[reader] = self._clamp(pacing)
+        return pacing
+
+    def tune(self, **limits: Union[str, float]) -> dict:
+        """한계값을 바꿉니다. 알 수 없는 이름이나 잘못된 값이면 ValueError."""
+        updates: Dict[str, float] = {}
+        for name, value in limits.items():
+            if name not in self.TUNABLE:
+                raise ValueError(f"조정할 수 없는 항목입니다: {name}")
+            integral = name in ("min_concurrency", "max_concurrency", "min_samples")
+            updates[name] = int(value) if integral else float(value)
+        with self._lock:
+            current: Dict[str, float] = {n: getattr(self, n) for n in self.TUNABLE}
+            current.update(updates)
+            # 일부만 바꾸더라도 바뀐 뒤의 전체 조합을 검사합니다.
+            self._check_limits(current)
+            for name, value in updates.items():
+                setattr(self, name, value)
+        return self.state()
+
+    @staticmethod
+    def _check_limits(limits: Dict[str, float]) -> None:
+        for name, value in limits.items():
+            if value < 0:
+                raise ValueError(f"{name}은 0 이상이어야 합니다.")
+        if limits["min_samples"] < 1:
+            raise ValueError("min_samples는 1 이상이어야 합니다.")
+        if limits["min_concurrency"] > limits["max_concurrency"]:
+            raise ValueError("min_concurrency는 max_concurrency 이하여야 합니다.")
+        if limits["base_delay"] > limits["max_delay"]:
+            raise ValueError("base_delay는 max_delay 이하여야 합니다.")
+
+    def state(self) -> dict:
+        with self._lock:
+            readers = list(self._pacing)
+        return {
+            "limits": {name: getattr(self, name) for name in self.TUNABLE},
+            "readers": {reader: self.pacing(reader)._asdict() for reader in readers},
+        }
+
+
+def serve_metrics(
+    metrics: StationMetrics,
+    regulator: Optional[Regulator] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> ThreadingHTTPServer:
+    """
+    지표 엔드포인트를 백그라운드 스레드로 띄웁니다.
+
+        GET  /metrics                       지표 + 조절기 상태 (JSON)
+        POST /regulator?max_concurrency=2   조절기 한계값 변경
+    """
+
+    class Handler(QuietHandler):
+        def _send(self, status: int, body: dict) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            if urlsplit(self.path).path != "/metrics":
+                return self._send(404, {"error": "not found"})
+            body = metrics.snapshot()
+            if regulator is not None:
+                body["regulator"] = regulator.state()
+            self._send(200, body)
+
+        def do_POST(self) -> None:
+            parts = urlsplit(self.path)
+            if parts.path != "/regulator" or regulator is None:
+                return self._send(404, {"error": "not found"})
+            query = parse_qs(parts.query)
+            limits = {name: values[-1] for name, values in query.items()}
+            try:
+                self._send(200, regulator.tune(**limits))
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+
+    return serve_in_background(Handler, host, port)
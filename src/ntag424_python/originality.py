@@ -0,0 +1,186 @@
+"""
+NXP 원본성 서명(Originality Signature) 일괄 검증.
+
+Read_Sig로 읽은 56바이트 서명(r || s)을 UID에 대해 ECDSA(secp224r1, 해시 없음)로
+검증합니다 (AN12196 7.2). 공개 키는 고정이므로 생성점 G와 공개 키 Q의
+고정 기반(fixed-base) 테이블을 한 번 계산해 두고, 검증마다 점 배가(doubling) 없이
+테이블 덧셈만으로 u1*G + u2*Q를 구합니다. 결과는 UID별로 메모이즈합니다.
+"""
+
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from .cache import BoundedCache
+
+# NTAG 424 DNA 공개 키 (AN12196 7.2, SEC1 비압축 형식)
+NXP_PUBLIC_KEY = bytes.fromhex(
+    "048A9B380AF2EE1B98DC417FECC263F8449C7625CECE82D9B916C992DA"
+    "209D68422B81EC20B65A66B5102A61596AF3379200599316A00A1410"
+)
+
+SIGNATURE_LENGTH = 56
+
+# secp224r1 도메인 파라미터
+_P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF000000000000000000000001
+_A = _P - 3
+_B = 0xB4050A850C04B3ABF54132565044B0B7D7BFD8BA270B39432355FFB4
+_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFF16A2E0B8F03E13DD29455C5C2A3D
+_G = (
+    0xB70E0CBD6BB4BF7F321390B94A03C1D356C21122343280D6115C1D21,
+    0xBD376388B5F723FB4C22DFE6CD4375A05A07476444D5819985007E34,
+)
+_COORD_LEN = 28
+
+# 고정 기반 테이블 윈도우 (4비트 -> 56개 자리 x 15개 점)
+_WINDOW = 4
+_DIGITS = (_N.bit_length() + _WINDOW - 1) // _WINDOW
+
+Point = Tuple[int, int]
+JacobianPoint = Tuple[int, int, int]
+_INFINITY: JacobianPoint = (1, 1, 0)
+
+
+def _jacobian_double(p: JacobianPoint) -> JacobianPoint:
+    x, y, z = p
+    if not z or not y:
+        return _INFINITY
+    # a = -3 최적화
+    zz = z * z % _P
+    m = 3 * (x - zz) * (x + zz) % _P
+    yy = y * y % _P
+    s = 4 * x * yy % _P
+    x3 = (m * m - 2 * s) % _P
+    y3 = (m * (s - x3) - 8 * yy * yy) % _P
+    z3 = 2 * y * z % _P
+    return x3, y3, z3
+
+
+def _jacobian_add_affine(p: JacobianPoint, q: Point) -> JacobianPoint:
+    """Jacobian 점 + 아핀 점 (mixed addition)."""
+    x1, y1, z1 = p
+    if not z1:
+        return q[0], q[1], 1
+    x2, y2 = q
+    zz = z1 * z1 % _P
+    u2 = x2 * zz % _P
+    s2 = y2 * zz * z1 % _P
+    h = (u2 - x1) % _P
+    r = (s2 - y1) % _P
+    if not h:
+        return _jacobian_double(p) if not r else _INFINITY
+    hh = h * h % _P
+    hhh = h * hh % _P
+    v = x1 * hh % _P
+    x3 = (r * r - hhh - 2 * v) % _P
+    y3 = (r * (v - x3) - y1 * hhh) % _P
+    z3 = z1 * h % _P
+    return x3, y3, z3
+
+
+def _to_affine(p: JacobianPoint) -> Optional[Point]:
+    x, y, z = p
+    if not z:
+        return None
+    z_inv = pow(z, -1, _P)
+    zz_inv = z_inv * z_inv % _P
+    return x * zz_inv % _P, y * zz_inv * z_inv % _P
+
+
+def _to_affine_point(p: JacobianPoint) -> Point:
+    """무한원점이 아님이 보장된 점(테이블 항목)을 아핀 좌표로 바꿉니다."""
+    affine = _to_affine(p)
+    if affine is None:
+        raise ValueError("고정 기반 테이블에 무한원점이 나올 수 없습니다.")
+    return affine
+
+
+@lru_cache(maxsize=8)
+def _fixed_base_table(base: Point) -> Tuple[Tuple[Point, ...], ...]:
+    """
+    table[i][d - 1] = d * 16^i * base (d = 1..15), 모두 아핀 좌표.
+    스칼라 곱은 자리마다 테이블 값 하나를 더하는 것으로 끝납니다.
+    """
+    table = []
+    row_base: JacobianPoint = (base[0], base[1], 1)
+    for _ in range(_DIGITS):
+        row = []
+        acc = _INFINITY
+        row_base_affine = _to_affine_point(row_base)
+        for _ in range((1 << _WINDOW) - 1):
+            acc = _jacobian_add_affine(acc, row_base_affine)
+            row.append(_to_affine_point(acc))
+        table.append(tuple(row))
+        for _ in range(_WINDOW):
+            row_base = _jacobian_double(row_base)
+    return tuple(table)
+
+
+def _fixed_base_mul(
+    table: Tuple[Tuple[Point, ...], ...], k: int, acc: JacobianPoint = _INFINITY
+) -> JacobianPoint:
+    mask = (1 << _WINDOW) - 1
+    for row in table:
+        digit = k & mask
+        if digit:
+            acc = _jacobian_add_affine(acc, row[digit - 1])
+        k >>= _WINDOW
+    return acc
+
+
+def _decode_public_key(public_key: bytes) -> Point:
+    if len(public_key) != 1 + 2 * _COORD_LEN or public_key[0] != 0x04:
+        raise ValueError("공개 키는 비압축 SEC1 형식(04 || X || Y)이어야 합니다.")
+    x = int.from_bytes(public_key[1:1 + _COORD_LEN], 'big')
+    y = int.from_bytes(public_key[1 + _COORD_LEN:], 'big')
+    if (y * y - (x * x * x + _A * x + _B)) % _P:
+        raise ValueError("공개 키가 secp224r1 곡선 위의 점이 아닙니다.")
+    return x, y
+
+
+class OriginalityVerifier:
+    """
+    (UID, 서명) 쌍을 NXP 공개 키로 검증합니다.
+
+    생성점/공개 키 테이블은 프로세스 단위로 캐시되고,
+    검증 결과는 UID별로 최대 cache_size개까지 보관합니다.
+    """
+
+    def __init__(self, public_key: bytes = NXP_PUBLIC_KEY, cache_size: int = 65536):
+        self._g_table = _fixed_base_table(_G)
+        self._q_table = _fixed_base_table(_decode_public_key(public_key))
+        self._results: BoundedCache[bytes, Tuple[bytes, bool]] = BoundedCache(
+            cache_size
+        )
+
+    def _verify(self, uid: bytes, signature: bytes) -> bool:
+        if len(signature) != SIGNATURE_LENGTH:
+            return False
+        r = int.from_bytes(signature[:_COORD_LEN], 'big')
+        s = int.from_bytes(signature[_COORD_LEN:], 'big')
+        if not (0 < r < _N and 0 < s < _N):
+            return False
+
+        # 메시지는 해시하지 않은 UID 그 자체입니다 (UID는 224비트보다 짧음).
+        e = int.from_bytes(uid, 'big')
+        w = pow(s, -1, _N)
+        point = _fixed_base_mul(self._g_table, e * w % _N)
+        point = _fixed_base_mul(self._q_table, r * w % _N, point)
+        affine = _to_affine(point)
+        return affine is not None and affine[0] % _N == r
+
+    def verify(self, uid: bytes, signature: bytes) -> bool:
+        """UID 하나의 서명을 검증합니다. 같은 (UID, 서명)은 캐시에서 응답합니다."""
+        uid = bytes(uid)
+        signature = bytes(signature)
+        cached = self._results.get(uid)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        valid = self._verify(uid, signature)
+        self._results.put(uid, (signature, valid))
+        return valid
+
+    def verify_many(self, pairs: Iterable[Tuple[bytes, bytes]]) -> List[bool]:
+        """(UID, 서명) 쌍 여러 개를 순서대로 검증합니다."""
+        verify = self.verify
+        return [verify(uid, signature) for uid, signature in pairs]
@@ -0,0 +1,107 @@
+"""
+Random ID 태그를 위한 UID 기반 키 선택.
+
+Random ID가 켜진 태그는 충돌 방지 단계의 UID가 탭마다 바뀌는 4바이트 임시 값이므로,
+get_derived_key(key_no, uid)에 넣을 실제 UID를 GetCardUID로 먼저 읽어야 합니다.
+KeyResolver는 파생하지 않은 부트스트랩 키로 인증 -> GetCardUID -> 파생 키 조회
+-> 같은 애플리케이션 선택 상태에서 파생 키로 재인증 순서로 진행합니다.
+리더기가 7바이트 실제 UID를 알려 주면 부트스트랩 단계를 건너뛰고 바로 인증합니다.
+"""
+
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, Tuple
+
+from .cache import BoundedCache
+from .exceptions import AuthenticationError
+from .session import UID_LENGTH
+
+if TYPE_CHECKING:
+    from .driver import NTAG424Driver
+
+
+class Resolution(NamedTuple):
+    """KeyResolver.resolve 결과. 드라이버 세션은 key_no/key로 인증된 상태입니다."""
+
+    uid: bytes
+    key_no: int
+    key: bytes
+    bootstrapped: bool  # GetCardUID 경로를 거쳤으면 True
+
+
+class KeyResolver:
+    """
+    태그의 실제 UID를 알아내고 UID별 파생 키로 인증합니다.
+
+    파생 키는 (key_no, UID)별로 최대 cache_size개까지 보관하며, 배포 목록이 있으면
+    prewarm()으로 미리 채워 두어 태그 처리 중에는 조회만 하도록 할 수 있습니다.
+
+    Args:
+        key_for: (key_no, uid) -> 파생 키 (예: key_manager.get_derived_key)
+        bootstrap_key_no: GetCardUID 세션에 쓸, UID별로 파생하지 않은 키 번호
+        bootstrap_key: 해당 키 값
+    """
+
+    def __init__(
+        self,
+        key_for: Callable[[int, bytes], bytes],
+        bootstrap_key_no: int,
+        bootstrap_key: bytes,
+        cache_size: int = 65536,
+    ):
+        self.key_for = key_for
+        self.bootstrap_key_no = bootstrap_key_no
+        self.bootstrap_key = bootstrap_key
+        self._keys: BoundedCache[Tuple[int, bytes], bytes] = BoundedCache(cache_size)
+
+    def key(self, key_no: int, uid: bytes) -> bytes:
+        """(key_no, UID)의 파생 키. 캐시에 없으면 파생하여 보관합니다."""
+        cache_key: Tuple[int, bytes] = (key_no, bytes(uid))
+        key = self._keys.get(cache_key)
+        if key is None:
+            key = self.key_for(key_no, cache_key[1])
+            self._keys.put(cache_key, key)
+        return key
+
+    def prewarm(self, uids: Iterable[bytes], key_nos: Iterable[int] = (0,)) -> int:
+        """
+        배포된 태그의 파생 키를 미리 계산합니다. 백그라운드 스레드에서 호출해도 됩니다.
+        캐시에 들어 있는 항목 수를 반환합니다.
+        """
+        key_nos = tuple(key_nos)
+        for uid in uids:
+            for key_no in key_nos:
+                self.key(key_no, uid)
+        return len(self._keys)
+
+    def resolve(self, driver: "NTAG424Driver", key_no: int = 0) -> Resolution:
+        """
+        SELECT가 끝난 태그에 대해 실제 UID를 알아내고 key_no의 파생 키로 인증합니다.
+        인증에 실패하면 AuthenticationError를 발생시킵니다.
+        """
+        # Random ID가 꺼져 있으면 리더기가 이미 실제 UID(7바이트)를 알고 있습니다.
+        reader_uid = driver.reader_uid()
+        if reader_uid is not None and len(reader_uid) == UID_LENGTH:
+            key = self.key(key_no, reader_uid)
+            if not driver.authenticate_ev2_first(key_no=key_no, key=key):
+                raise AuthenticationError(
+                    f"Key {key_no} 인증 실패 (UID {reader_uid.hex().upper()})"
+                )
+            return Resolution(reader_uid, key_no, key, False)
+
+        if not driver.authenticate_ev2_first(
+            key_no=self.bootstrap_key_no, key=self.bootstrap_key
+        ):
+            raise AuthenticationError(
+                f"부트스트랩 Key {self.bootstrap_key_no} 인증 실패"
+            )
+        uid = driver.get_card_uid()
+        key = self.key(key_no, uid)
+        if key_no == self.bootstrap_key_no and key == self.bootstrap_key:
+            # 이미 목표 키로 인증된 세션이므로 재인증하지 않습니다.
+            return Resolution(uid, key_no, key, True)
+
+        # 애플리케이션 선택은 유지되므로 다시 SELECT하지 않고 바로 재인증합니다.
+        if not driver.authenticate_ev2_first(key_no=key_no, key=key):
+            raise AuthenticationError(
+                f"Key {key_no} 인증 실패 (UID {uid.hex().upper()})"
+            )
+        return Resolution(uid, key_no, key, True)
@@ -0,0 +1,183 @@
+"""
+SDM(Secure Dynamic Messaging) / SUN 메시지 복호화 및 검증.
+
+태그가 URL에 미러링한 암호화 PICCData(enc)와 SDMMAC(cmac)를 서버 측에서
+검증합니다 (AN12196 3.3 ~ 3.4). 리더기 없이 동작하므로 pyscard를 import하지 않습니다.
+"""
+
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from Crypto.Cipher import AES
+
+from .crypto import Cmac, compare
+from .session import UID_LENGTH, VerificationResult
+
+if TYPE_CHECKING:
+    from Crypto.Cipher._mode_ecb import EcbMode
+
+# PICCDataTag 비트 (AN12196 Table 2)
+PICC_DATA_TAG_UID = 0x80
+PICC_DATA_TAG_READ_CTR = 0x40
+PICC_DATA_TAG_UID_LEN_MASK = 0x0F
+
+# 세션 키 유도용 SV 접두어 (AN12196 Table 3, 4)
+SV_ENC_PREFIX = bytes.fromhex("C33C00010080")
+SV_MAC_PREFIX = bytes.fromhex("3CC300010080")
+
+
+def decrypt_picc_data(
+    enc_picc_data: bytes, meta_read_key: bytes
+) -> Tuple[bytes, Optional[int]]:
+    """
+    암호화된 PICCData를 복호화하여 (UID, SDMReadCtr)를 반환합니다.
+
+    PICCDataTag가 미러링 설정과 맞지 않으면(잘못된 키 등) ValueError를 발생시킵니다.
+    """
+    cipher = AES.new(meta_read_key, AES.MODE_CBC, bytes(16))
+    picc_data = cipher.decrypt(enc_picc_data)
+
+    tag = picc_data[0]
+    pos = 1
+    uid = b""
+    read_ctr = None
+    if tag & PICC_DATA_TAG_UID:
+        if tag & PICC_DATA_TAG_UID_LEN_MASK != UID_LENGTH:
+            raise ValueError(f"잘못된 PICCDataTag: {tag:02X}")
+        uid = picc_data[pos:pos + UID_LENGTH]
+        pos += UID_LENGTH
+    if tag & PICC_DATA_TAG_READ_CTR:
+        read_ctr = int.from_bytes(picc_data[pos:pos + 3], 'little')
+    if tag & 0x30 or not tag & (PICC_DATA_TAG_UID | PICC_DATA_TAG_READ_CTR):
+        raise ValueError(f"잘못된 PICCDataTag: {tag:02X}")
+    return uid, read_ctr
+
+
+def _session_vector(prefix: bytes, uid: bytes, read_ctr: Optional[int]) -> bytes:
+    """SV1/SV2 = 접두어 || [UID] || [SDMReadCtr] || ZeroPadding (16바이트 배수)."""
+    sv = prefix + uid
+    if read_ctr is not None:
+        sv += read_ctr.to_bytes(3, 'little')
+    return sv + bytes(-len(sv) % 16)
+
+
+def derive_session_mac_key(
+    file_read_key: bytes, uid: bytes, read_ctr: Optional[int]
+) -> bytes:
+    """SesSDMFileReadMACKey = CMAC(KSDMFileRead; SV2)."""
+    # SDMFileRead 키는 UID별 파생 키이므로 프로세스 캐시(cmac_for)에 넣지 않습니다.
+    return Cmac(file_read_key).mac(_session_vector(SV_MAC_PREFIX, uid, read_ctr))
+
+
+def derive_session_enc_key(
+    file_read_key: bytes, uid: bytes, read_ctr: Optional[int]
+) -> bytes:
+    """SesSDMFileReadENCKey = CMAC(KSDMFileRead; SV1)."""
+    return Cmac(file_read_key).mac(_session_vector(SV_ENC_PREFIX, uid, read_ctr))
+
+
+def _decrypt_file_data(
+    cipher: "EcbMode", read_ctr: int, enc_file_data: bytes
+) -> bytes:
+    """
+    IV = E(SesSDMFileReadENCKey; SDMReadCtr || 0^13) 로 CBC 복호화합니다.
+    ECB 객체 하나로 IV 계산과 블록 복호화를 모두 처리합니다
+    (CBC = ECB 복호화 XOR 이전 블록).
+    """
+    iv = cipher.encrypt(read_ctr.to_bytes(3, 'little') + bytes(13))
+    blocks = cipher.decrypt(enc_file_data)
+    chain = iv + enc_file_data[:-16]
+    size = len(enc_file_data)
+    plain = int.from_bytes(blocks, 'big') ^ int.from_bytes(chain, 'big')
+    return plain.to_bytes(size, 'big')
+
+
+def decrypt_file_data(
+    file_read_key: bytes, uid: bytes, read_ctr: int, enc_file_data: bytes
+) -> bytes:
+    """SDMENCFileData(미러링된 암호문, 16바이트 배수)를 평문으로 복호화합니다."""
+    if not enc_file_data or len(enc_file_data) % 16:
+        raise ValueError("SDMENCFileData 길이는 16바이트의 배수여야 합니다.")
+    session_enc_key = derive_session_enc_key(file_read_key, uid, read_ctr)
+    cipher = AES.new(session_enc_key, AES.MODE_ECB)
+    return _decrypt_file_data(cipher, read_ctr, enc_file_data)
+
+
+class Tap(NamedTuple):
+    """SDMENCFileData 복호화 입력 하나 (검증된 UID/카운터 + 암호문)."""
+
+    uid: bytes
+    read_ctr: int
+    enc_file_data: bytes
+
+
+def decrypt_file_data_batch(
+    taps: Iterable[Tap], file_read_key_for: Callable[[bytes], bytes]
+) -> List[bytes]:
+    """
+    여러 탭의 SDMENCFileData를 한 번에 복호화합니다.
+
+    세션 암호화 키(와 그 AES 객체)는 (UID, 카운터)마다 한 번만 유도하고,
+    SDMFileRead 키는 UID마다 한 번만 조회합니다.
+    """
+    file_keys: Dict[bytes, bytes] = {}
+    ciphers: Dict[Tuple[bytes, int], "EcbMode"] = {}
+    results = []
+    for uid, read_ctr, enc_file_data in taps:
+        if not enc_file_data or len(enc_file_data) % 16:
+            raise ValueError("SDMENCFileData 길이는 16바이트의 배수여야 합니다.")
+        cipher = ciphers.get((uid, read_ctr))
+        if cipher is None:
+            file_key = file_keys.get(uid)
+            if file_key is None:
+                file_key = file_keys[uid] = file_read_key_for(uid)
+            session_enc_key = derive_session_enc_key(file_key, uid, read_ctr)
+            cipher = ciphers[(uid, read_ctr)] = AES.new(session_enc_key, AES.MODE_ECB)
+        results.append(_decrypt_file_data(cipher, read_ctr, enc_file_data))
+    return results
+
+
+def calc_sdm_mac(session_mac_key: bytes, mac_input: bytes = b"") -> bytes:
+    """
+    SDMMAC = MACt(SesSDMFileReadMACKey; DynamicFileData[MACInputOffset:MACOffset]).
+    세션 키는 탭마다 바뀌므로 cmac_for 캐시에 넣지 않습니다.
+    """
+    return Cmac(session_mac_key).mac_t(mac_input)
+
+
+def verify_sun(
+    enc_picc_data: bytes,
+    cmac: bytes,
+    meta_read_key: bytes,
+    file_read_key: bytes,
+    mac_input: bytes = b"",
+) -> VerificationResult:
+    """
+    SUN 메시지 하나를 검증합니다.
+
+    Args:
+        enc_picc_data (bytes): URL의 enc 값 (16 bytes)
+        cmac (bytes): URL의 cmac 값 (8 bytes)
+        meta_read_key (bytes): SDMMetaRead 키 (PICCData 복호화용)
+        file_read_key (bytes): SDMFileRead 키 (SDMMAC 계산용)
+        mac_input (bytes): DynamicFileData[SDMMACInputOffset:SDMMACOffset]
+
+    Returns:
+        VerificationResult: 복호화 실패 시 UID는 0으로 채워지고 valid=False
+    """
+    try:
+        uid, read_ctr = decrypt_picc_data(enc_picc_data, meta_read_key)
+    except ValueError:
+        return VerificationResult(bytes(UID_LENGTH), 0, False)
+
+    session_mac_key = derive_session_mac_key(file_read_key, uid, read_ctr)
+    valid = compare(calc_sdm_mac(session_mac_key, mac_input), cmac)
+    return VerificationResult(uid, read_ctr or 0, valid)
@@ -0,0 +1,174 @@
+"""
+세션 상태 및 결과 레코드.
+
+PC/SC 연결(transport)과 분리된 경량 객체들입니다. 모두 `__slots__` 기반이라
+수십만 개를 동시에 들고 있어도 항목당 메모리가 작고 고정적이며,
+`struct` 기반의 고정 길이 바이너리로 직렬화하여 저널에 기록할 수 있습니다.
+
+콜드 스타트 비용 때문에 dataclasses 대신 NamedTuple과 수동 `__slots__`를 사용합니다.
+"""
+
+import struct
+from enum import IntEnum
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .crypto import Cmac
+
+UID_LENGTH = 7
+
+# NamedTuple 본문에는 필드 외의 클래스 속성을 둘 수 없으므로 형식은 모듈 상수로 둡니다.
+_TAG_RESULT_STRUCT = struct.Struct("<7s?Bd")
+_VERIFICATION_RESULT_STRUCT = struct.Struct("<7sI?")
+TAG_RESULT_SIZE = _TAG_RESULT_STRUCT.size
+VERIFICATION_RESULT_SIZE = _VERIFICATION_RESULT_STRUCT.size
+
+
+class Step(IntEnum):
+    """프로비저닝 단계. 실패 지점 기록에 사용합니다 (1바이트로 직렬화)."""
+
+    NONE = 0
+    CONNECT = 1
+    SELECT = 2
+    AUTH = 3
+    SETTINGS = 4
+    WRITE = 5
+    CHANGE_KEY = 6
+
+
+class SessionState:
+    """
+    EV2 보안 메시징 세션 상태 (TI, CmdCtr, 세션 키).
+
+    직렬화 형식 (38 bytes): TI(4) + CmdCtr(2, LE) + EncKey(16) + MacKey(16).
+    인증되지 않은 세션은 0으로 채워집니다.
+    MAC 키의 Cmac 객체는 세션 동안만 보관하고 reset() 시 함께 버립니다.
+    """
+
+    __slots__ = ("ti", "cmd_ctr", "enc_key", "mac_key", "_mac")
+
+    STRUCT = struct.Struct("<4sH16s16s")
+
+    def __init__(
+        self,
+        ti: Optional[bytes] = None,
+        cmd_ctr: int = 0,
+        enc_key: Optional[bytes] = None,
+        mac_key: Optional[bytes] = None,
+    ):
+        self.ti = ti
+        self.cmd_ctr = cmd_ctr
+        self.enc_key = enc_key
+        self.mac_key = mac_key
+        self._mac: Optional[Tuple[bytes, "Cmac"]] = None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SessionState):
+            return NotImplemented
+        return (self.ti, self.cmd_ctr, self.enc_key, self.mac_key) == (
+            other.ti, other.cmd_ctr, other.enc_key, other.mac_key
+        )
+
+    def __repr__(self) -> str:
+        ti = self.ti.hex() if self.ti else None
+        return (
+            f"SessionState(ti={ti}, cmd_ctr={self.cmd_ctr}, "
+            f"authenticated={self.is_authenticated})"
+        )
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self.enc_key is not None and self.mac_key is not None
+
+    def mac(self) -> "Cmac":
+        """현재 세션 MAC 키의 Cmac. 키가 바뀌면(재인증) 새로 만듭니다."""
+        if self.mac_key is None:
+            raise ValueError("세션 MAC 키가 없습니다.")
+        if self._mac is None or self._mac[0] != self.mac_key:
+            # session만 import하는 곳에서 암호 모듈을 로드하지 않도록 지연 import
+            from .crypto import Cmac
+
+            self._mac = (self.mac_key, Cmac(self.mac_key))
+        return self._mac[1]
+
+    def reset(self) -> None:
+        """세션 정보를 초기화합니다 (재인증 전 또는 연결 종료 시)."""
+        self.ti = None
+        self.cmd_ctr = 0
+        self.enc_key = None
+        self.mac_key = None
+        self._mac = None
+
+    def to_bytes(self) -> bytes:
+        return self.STRUCT.pack(
+            self.ti or bytes(4),
+            self.cmd_ctr,
+            self.enc_key or bytes(16),
+            self.mac_key or bytes(16),
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SessionState":
+        ti, cmd_ctr, enc_key, mac_key = cls.STRUCT.unpack(data)
+        if not any(enc_key) and not any(mac_key):
+            return cls(cmd_ctr=cmd_ctr)
+        return cls(ti=ti, cmd_ctr=cmd_ctr, enc_key=enc_key, mac_key=mac_key)
+
+
+class TagResult(NamedTuple):
+    """
+    태그 한 개에 대한 프로비저닝 결과.
+
+    직렬화 형식 (17 bytes): UID(7) + ok(1) + 실패 단계(1) + 타임스탬프(8, double).
+    """
+
+    uid: bytes
+    ok: bool
+    failed_step: Step = Step.NONE
+    timestamp: float = 0.0
+
+    def to_bytes(self) -> bytes:
+        return _TAG_RESULT_STRUCT.pack(
+            self.uid, self.ok, self.failed_step, self.timestamp
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TagResult":
+        uid, ok, step, timestamp = _TAG_RESULT_STRUCT.unpack(data)
+        return cls(uid, ok, Step(step), timestamp)
+
+    @classmethod
+    def iter_from_bytes(cls, data: bytes) -> Iterator["TagResult"]:
+        """여러 레코드가 이어 붙은 저널 버퍼를 순서대로 복원합니다."""
+        for uid, ok, step, timestamp in _TAG_RESULT_STRUCT.iter_unpack(data):
+            yield cls(uid, ok, Step(step), timestamp)
+
+
+class VerificationResult(NamedTuple):
+    """
+    SUN 메시지(enc/cmac) 검증 결과.
+
+    직렬화 형식 (12 bytes): UID(7) + SDMReadCtr(4, LE) + valid(1).
+    """
+
+    uid: bytes
+    read_ctr: int
+    valid: bool
+
+    def to_bytes(self) -> bytes:
+        return _VERIFICATION_RESULT_STRUCT.pack(self.uid, self.read_ctr, self.valid)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "VerificationResult":
+        return cls._make(_VERIFICATION_RESULT_STRUCT.unpack(data))
+
+    @classmethod
+    def iter_from_bytes(cls, data: bytes) -> Iterator["VerificationResult"]:
+        """여러 레코드가 이어 붙은 저널 버퍼를 순서대로 복원합니다."""
+        for fields in _VERIFICATION_RESULT_STRUCT.iter_unpack(data):
+            yield cls._make(fields)
+
+
+def pack_results(results: Iterable[Union[TagResult, VerificationResult]]) -> bytes:
+    """같은 종류의 결과 레코드들을 하나의 연속된 바이너리로 묶습니다."""
+    return b"".join(r.to_bytes() for r in results)
@@ -0,0 +1,16 @@
+"""
+지연 분포 요약에 쓰는 간단한 통계 함수.
+
+스테이션 지표(metrics)와 검증 서버 부하 테스트(loadgen)가 같은 방식으로
+백분위를 계산하도록 두 모듈이 함께 사용합니다.
+"""
+
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """q 백분위 값 (가장 가까운 순위). 값이 없으면 0.0."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
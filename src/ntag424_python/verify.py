@@ -0,0 +1,140 @@
+"""
+하드웨어 없이 SUN URL을 검증하는 CLI.
+
+    python -m ntag424_python.verify "https://...?enc=...&cmac=..." \
+        [--meta-key HEX] [--file-key HEX]
+
+검증 워커나 짧게 실행되는 핸들러용 진입점이므로 pyscard 및 드라이버 모듈을
+import하지 않습니다. 콜드 스타트 예산은 COLD_START_BUDGET_MS이며,
+`python -X importtime -m ntag424_python.verify` 로 측정할 수 있습니다.
+"""
+
+import sys
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from .crypto import compare
+from .layout import mac_input_from_url, parse_file_data, parse_sun_url
+from .sdm import (
+    calc_sdm_mac,
+    decrypt_file_data,
+    decrypt_picc_data,
+    derive_session_mac_key,
+    verify_sun,
+)
+from .session import UID_LENGTH, VerificationResult
+
+# 모듈 import(인터프리터 기동 제외)에 허용하는 시간
+COLD_START_BUDGET_MS = 150
+
+DEFAULT_KEY_HEX = "00" * 16
+
+
+def verify_url(
+    url: str,
+    meta_read_key: bytes,
+    file_read_key: bytes,
+    mac_input_offset: int = 0,
+) -> VerificationResult:
+    """main.py가 설정한 레이아웃(enc/cmac)의 URL 하나를 검증합니다."""
+    enc, cmac = parse_sun_url(url)
+    mac_input = mac_input_from_url(url, mac_input_offset)
+    return verify_sun(enc, cmac, meta_read_key, file_read_key, mac_input)
+
+
+class SunVerifier:
+    """
+    서버 측 SUN URL 검증기.
+
+    SDMFileRead 키는 UID별로 파생(diversification)될 수 있으므로 함수로 받고,
+    UID별 마지막 SDMReadCtr를 기억하여 재사용(replay)된 URL을 거부합니다.
+    SDMMetaRead 키는 UID를 알기 전에 필요하므로 파생하지 않은 고정 키입니다.
+    """
+
+    def __init__(
+        self,
+        meta_read_key: bytes,
+        file_read_key_for: Callable[[bytes], bytes],
+        mac_input_offset: int = 0,
+    ):
+        self.meta_read_key = meta_read_key
+        self.file_read_key_for = file_read_key_for
+        self.mac_input_offset = mac_input_offset
+        self._last_ctr: dict = {}
+        self._lock = threading.Lock()
+
+    def _verify(self, url: str) -> Tuple[VerificationResult, Optional[bytes]]:
+        """검증 결과와 이 검증에 사용한 SDMFileRead 키(조회하지 않았으면 None)."""
+        enc, cmac = parse_sun_url(url)
+        try:
+            uid, read_ctr = decrypt_picc_data(enc, self.meta_read_key)
+        except ValueError:
+            return VerificationResult(bytes(UID_LENGTH), 0, False), None
+        read_ctr = read_ctr or 0
+
+        file_read_key = self.file_read_key_for(uid)
+        session_mac_key = derive_session_mac_key(file_read_key, uid, read_ctr)
+        mac_input = mac_input_from_url(url, self.mac_input_offset)
+        if not compare(calc_sdm_mac(session_mac_key, mac_input), cmac):
+            return VerificationResult(uid, read_ctr, False), file_read_key
+
+        with self._lock:
+            if read_ctr <= self._last_ctr.get(uid, -1):
+                return VerificationResult(uid, read_ctr, False), file_read_key
+            self._last_ctr[uid] = read_ctr
+        return VerificationResult(uid, read_ctr, True), file_read_key
+
+    def verify(self, url: str) -> VerificationResult:
+        return self._verify(url)[0]
+
+    def verify_with_data(self, url: str) -> Tuple[VerificationResult, bytes]:
+        """
+        URL을 검증하고 data 값(SDMENCFileData)을 복호화한 평문을 함께 반환합니다.
+        검증에 실패했거나 data가 없으면 평문은 빈 바이트열입니다.
+        SDMFileRead 키는 검증에 쓴 것을 그대로 사용합니다 (탭당 한 번만 조회).
+        """
+        result, file_read_key = self._verify(url)
+        enc_file_data = parse_file_data(url)
+        if not result.valid or not enc_file_data or file_read_key is None:
+            return result, b""
+        plaintext = decrypt_file_data(
+            file_read_key, result.uid, result.read_ctr, enc_file_data
+        )
+        return result, plaintext
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # argparse는 CLI로 실행될 때만 필요하므로 워커의 import 경로에서 제외합니다.
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NTAG 424 DNA SUN URL 검증")
+    parser.add_argument("url", help="태그가 생성한 전체 URL")
+    parser.add_argument(
+        "--meta-key", default=DEFAULT_KEY_HEX, help="SDMMetaRead 키 (hex)"
+    )
+    parser.add_argument(
+        "--file-key", default=DEFAULT_KEY_HEX, help="SDMFileRead 키 (hex)"
+    )
+    parser.add_argument(
+        "--mac-input-offset", type=int, default=0, help="SDMMACInputOffset (기본값 0)"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        result = verify_url(
+            args.url,
+            bytes.fromhex(args.meta_key),
+            bytes.fromhex(args.file_key),
+            args.mac_input_offset,
+        )
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    status = "✅ 유효" if result.valid else "❌ 무효"
+    print(f"{status} UID={result.uid.hex().upper()} Ctr={result.read_ctr}")
+    return 0 if result.valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+import pytest
+
+
+class FakeConnection:
+    """정해 둔 응답을 순서대로 돌려주고 보낸 APDU를 기록하는 PC/SC 연결."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def transmit(self, apdu):
+        self.sent.append(apdu)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def fake_connection():
+    """응답 목록으로 FakeConnection을 만드는 팩토리."""
+    return FakeConnection
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ntag424_python.verify import COLD_START_BUDGET_MS
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+
+PROBE = """
+import sys, time
+t = time.perf_counter()
+import ntag424_python.verify
+elapsed = (time.perf_counter() - t) * 1000
+assert "smartcard" not in sys.modules
+assert "ntag424_python.driver" not in sys.modules
+print(elapsed)
+"""
+
+
+def _probe():
+    env = dict(os.environ, PYTHONPATH=SRC)
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout)
+
+
+def test_verifier_imports_without_pyscard():
+    # PROBE 안의 assert가 실패하면 check=True로 CalledProcessError가 납니다.
+    _probe()
+
+
+# 벽시계 시간은 CI 부하에 따라 흔들리므로 명시적으로 켰을 때만 검사합니다.
+@pytest.mark.skipif(
+    not os.environ.get("NTAG424_COLD_START_TIMING"),
+    reason="NTAG424_COLD_START_TIMING=1일 때만 import 시간을 측정합니다.",
+)
+def test_verifier_cold_start_within_budget():
+    assert min(_probe() for _ in range(3)) < COLD_START_BUDGET_MS
+
+
+def test_driver_is_loaded_lazily():
+    import ntag424_python
+
+    assert ntag424_python.NTAG424Driver.__name__ == "NTAG424Driver"
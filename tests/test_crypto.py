@@ -0,0 +1,99 @@
+import os
+import random
+
+from Crypto.Cipher import AES
+from Crypto.Hash import CMAC
+
+from ntag424_python.crypto import Cmac, cmac_for, compare, truncate_mac
+from ntag424_python.driver import NTAG424Driver
+
+# AN12196 Table 4: 빈 메시지에 대한 SDMMAC
+SDM_SESSION_MAC_KEY = bytes.fromhex("3FB5F6E3A807A03D5E3570ACE393776F")
+
+
+def _reference_cmac(key: bytes, msg: bytes) -> bytes:
+    cobj = CMAC.new(key, ciphermod=AES)
+    cobj.update(msg)
+    return cobj.digest()
+
+
+def test_zero_length_message_an12196():
+    cmac = Cmac(SDM_SESSION_MAC_KEY)
+    assert cmac.mac(b"") == bytes.fromhex("E194C7EE12D9F7EE8A65C8331B704386")
+    assert cmac.mac_t(b"") == bytes.fromhex("94EED9EE65337086")
+
+
+def test_matches_reference_cmac():
+    rng = random.Random(424)
+    # 블록 경계, 짧은 메시지(블록 루프), 긴 메시지(CBC 경로)를 모두 거칩니다.
+    for length in list(range(0, 66)) + [80, 81, 255, 256]:
+        key = rng.randbytes(16)
+        msg = rng.randbytes(length)
+        full = _reference_cmac(key, msg)
+        assert Cmac(key).mac(msg) == full
+        assert cmac_for(key).mac_t(msg) == truncate_mac(full) == full[1::2]
+
+
+def test_batch():
+    key = os.urandom(16)
+    msgs = [os.urandom(n) for n in (0, 7, 16, 33)]
+    cmac = cmac_for(key)
+    assert cmac.mac_many(msgs) == [_reference_cmac(key, m) for m in msgs]
+    assert cmac.mac_t_many(msgs) == [_reference_cmac(key, m)[1::2] for m in msgs]
+    assert cmac_for(key) is cmac
+
+
+def test_verify_and_compare():
+    cmac = Cmac(SDM_SESSION_MAC_KEY)
+    good = bytes.fromhex("94EED9EE65337086")
+    assert cmac.verify_t(b"", good)
+    assert not cmac.verify_t(b"", good[:-1] + b"\x00")
+    assert compare(good, bytes(good))
+    assert not compare(good, good[:7])
+
+
+def test_driver_change_file_settings_an12196():
+    """AN12196 Table 18: ChangeFileSettings 암호문과 명령 MAC."""
+    tag = NTAG424Driver()
+    tag.session.enc_key = bytes.fromhex("1309C877509E5A215007FF0ED19CA564")
+    tag.session.mac_key = bytes.fromhex("4C6626F5E72EA694202139295C7A7FC7")
+    tag.session.ti = bytes.fromhex("9D00C4DF")
+    tag.session.cmd_ctr = 1
+
+    params = bytes.fromhex("4000E0C1F121200000430000430000")
+    enc_data = tag._encrypt_packet(b"\x02", params)
+    assert enc_data == bytes.fromhex("61B6D97903566E84C3AE5274467E89EA")
+    assert tag._calc_mac(0x5F, b"\x02", enc_data) == bytes.fromhex("D799B7C1A0EF7A04")
+
+
+def test_driver_get_card_uid_mac_an12196():
+    """AN12196 Table 28: GetCardUID 명령 MAC과 응답 MAC."""
+    tag = NTAG424Driver()
+    tag.session.enc_key = bytes.fromhex("2B4D963C014DC36F24F69A50A394F875")
+    tag.session.mac_key = bytes.fromhex("379D32130CE61705DD5FD8C36B95D764")
+    tag.session.ti = bytes.fromhex("DF055522")
+    tag.session.cmd_ctr = 0
+
+    assert tag._calc_mac(0x51, b"", b"") == bytes.fromhex("8E2C155ADDA99BE3")
+    tag.session.cmd_ctr = 1
+    enc_resp = bytes.fromhex("70756055688505B52A5E26E59E329CD6")
+    assert tag._calc_mac(0x00, b"", enc_resp) == bytes.fromhex("595F672298EA41B7")
+
+
+def test_session_keys_stay_out_of_shared_cache():
+    """세션 MAC 키는 세션에만 보관되고 cmac_for 캐시에 들어가지 않습니다."""
+    tag = NTAG424Driver()
+    tag.session.mac_key = bytes.fromhex("379D32130CE61705DD5FD8C36B95D764")
+    tag.session.ti = bytes.fromhex("DF055522")
+    before = cmac_for.cache_info().currsize
+
+    tag._calc_mac(0x51, b"", b"")
+    cmac = tag.session.mac()
+    tag._calc_mac(0x51, b"", b"")
+    assert tag.session.mac() is cmac
+    assert cmac_for.cache_info().currsize == before
+
+    tag.session.mac_key = bytes(16)
+    assert tag.session.mac() is not cmac
+    tag.session.reset()
+    assert tag.session == NTAG424Driver().session
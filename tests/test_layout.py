@@ -0,0 +1,69 @@
+import pytest
+
+from ntag424_python.layout import (
+    build_ndef_file,
+    build_sdm_params,
+    calculate_layout,
+    calculate_offsets,
+)
+
+BASE_URL = "https://challenge.walkd.co.kr/dashboard"
+
+
+def test_default_layout_matches_main_params():
+    full_url, picc_offset, cmac_offset = calculate_offsets(BASE_URL)
+    # main.py가 직접 조립하던 값: C1 + F121 + PICC + 000000 + CMAC
+    expected = (
+        bytes([0xC1]) + bytes.fromhex("F121") + picc_offset.to_bytes(3, "little")
+        + bytes(3) + cmac_offset.to_bytes(3, "little")
+    )
+    layout = calculate_layout(BASE_URL)
+    assert layout.sdm_params(meta_read=2, file_read=1, ctr_ret=1) == expected
+    assert layout.file_data() == build_ndef_file(full_url)
+
+
+def test_an12196_enc_file_data_params():
+    # AN12196 Table 5: PICCData 1F, MACInput 44, ENC 44 / 20, MAC 6A
+    params = build_sdm_params(
+        0, 0, 0xE,
+        picc_data_offset=0x1F, mac_input_offset=0x44,
+        enc_offset=0x44, enc_length=0x20, mac_offset=0x6A,
+    )
+    assert params == bytes.fromhex(
+        "D1FE00" "1F0000" "440000" "440000" "200000" "6A0000"
+    )
+
+
+def test_enc_file_data_layout():
+    payload = b"WALKD-TOKEN-0001"
+    layout = calculate_layout(BASE_URL, len(payload))
+    assert layout.enc_length == 32
+    assert layout.url[layout.enc_offset - 7 - len("data="):].startswith("data=")
+    assert layout.cmac_offset == layout.enc_offset + 32 + len("&cmac=")
+
+    file_data = layout.file_data(payload)
+    assert file_data[layout.enc_offset:layout.enc_offset + 16] == payload
+    assert file_data[layout.enc_offset + 16:layout.enc_offset + 32] == b"0" * 16
+    assert layout.sdm_params(2, 1, 1)[0] == 0xD1
+
+
+def test_invalid_layouts_are_rejected():
+    with pytest.raises(ValueError):
+        calculate_layout(BASE_URL, 10)
+    with pytest.raises(ValueError):
+        calculate_layout(BASE_URL, 16).file_data(b"short")
+    with pytest.raises(ValueError):
+        build_sdm_params(2, 0xF, 1, picc_data_offset=10, enc_offset=50, enc_length=32)
+    with pytest.raises(ValueError):
+        build_ndef_file("https://x/" + "a" * 300)
+
+
+def test_plain_mirror_offsets_require_plain_meta_read():
+    # SDMMetaRead=F에서는 UID/ReadCtr 오프셋 필드를 보낼 수 없으므로 거부합니다.
+    with pytest.raises(ValueError):
+        build_sdm_params(0xF, 0xF, 0xF, uid_offset=20)
+    with pytest.raises(ValueError):
+        build_sdm_params(2, 0xF, 1, picc_data_offset=10, read_ctr_offset=40)
+
+    params = build_sdm_params(0xE, 0xF, 0xF, uid_offset=20, read_ctr_offset=35)
+    assert params == bytes([0xC1, 0xFF, 0xEF]) + bytes([20, 0, 0, 35, 0, 0])
@@ -0,0 +1,97 @@
+from Crypto.Cipher import AES
+from Crypto.Hash import CMAC
+
+from ntag424_python.layout import calculate_offsets
+from ntag424_python.loadgen import (
+    Kind,
+    SunUrlGenerator,
+    http_target,
+    read_urls,
+    run_load,
+    serve_verifier,
+    uid_router,
+    write_urls,
+)
+from ntag424_python.verify import SunVerifier
+
+BASE_URL = "https://challenge.walkd.co.kr/dashboard"
+META_KEY = bytes.fromhex("00112233445566778899AABBCCDDEEFF")
+MASTER_KEY = bytes(16)
+
+
+def file_key_for(uid):
+    # key_manager.get_derived_key와 같은 AES-CMAC(MasterKey, UID)
+    cobj = CMAC.new(MASTER_KEY, ciphermod=AES)
+    cobj.update(uid)
+    return cobj.digest()
+
+
+def make_pair(seed=1):
+    generator = SunUrlGenerator(
+        BASE_URL, META_KEY, file_key_for, tag_count=20, seed=seed
+    )
+    verifier = SunVerifier(META_KEY, file_key_for)
+    return generator, verifier
+
+
+def test_generated_urls_match_layout():
+    generator, verifier = make_pair()
+    template = calculate_offsets(BASE_URL)[0]
+    for _, url in generator.generate(50):
+        assert len(url) == len(template)
+        assert url.startswith(BASE_URL + "?enc=")
+
+
+def test_verdicts_match_kinds():
+    generator, verifier = make_pair()
+    for kind, url in generator.generate(500):
+        assert verifier.verify(url).valid == (kind is Kind.VALID), kind
+
+
+def test_replay_is_rejected():
+    generator, verifier = make_pair()
+    uid = generator.uids[0]
+    url = generator.make_url(uid, 7)
+    assert verifier.verify(url).valid
+    assert not verifier.verify(url).valid
+    assert not verifier.verify(generator.make_url(uid, 6)).valid
+    assert verifier.verify(generator.make_url(uid, 8)).valid
+
+
+def test_run_load_in_process(tmp_path):
+    generator, verifier = make_pair(seed=3)
+    path = str(tmp_path / "urls.txt")
+    assert write_urls(generator.generate(300), path) == 300
+
+    report = run_load(read_urls(path), lambda url: verifier.verify(url).valid)
+    assert report.requests == 300
+    assert report.unexpected == 0 and report.errors == 0
+    assert sum(report.by_kind.values()) == 300
+    assert report.percentile(50) <= report.percentile(99) <= report.percentile(100)
+    assert "req/s" in report.summary()
+
+
+def test_run_load_concurrent_keeps_per_uid_order():
+    generator, verifier = make_pair(seed=5)
+    report = run_load(
+        generator.generate(3000),
+        lambda url: verifier.verify(url).valid,
+        concurrency=8,
+        route=uid_router(META_KEY),
+    )
+    assert report.requests == 3000
+    assert report.unexpected == 0 and report.errors == 0
+
+
+def test_run_load_loopback():
+    generator, verifier = make_pair(seed=4)
+    server = serve_verifier(
+        lambda url: verifier.verify(url).valid, "https://challenge.walkd.co.kr"
+    )
+    try:
+        target = http_target(f"http://127.0.0.1:{server.server_address[1]}")
+        report = run_load(generator.generate(40), target, rate=2000)
+    finally:
+        server.shutdown()
+    assert report.requests == 40
+    assert report.unexpected == 0 and report.errors == 0
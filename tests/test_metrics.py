@@ -0,0 +1,139 @@
+import json
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from ntag424_python.exceptions import CommandError
+from ntag424_python.metrics import (
+    Regulator,
+    RingBuffer,
+    StationMetrics,
+    serve_metrics,
+)
+from ntag424_python.session import Step
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _run(metrics, clock, reader="R1", failed_step=Step.NONE, seconds=1.0):
+    run = metrics.begin(reader)
+    with run.step(Step.AUTH):
+        clock.now += seconds / 2
+    with run.step(Step.WRITE):
+        clock.now += seconds / 2
+    return run.finish(failed_step)
+
+
+def test_ring_buffer_keeps_latest():
+    buf = RingBuffer(3)
+    for i in range(5):
+        buf.append(i)
+    assert len(buf) == 3 and buf.capacity == 3
+    assert list(buf) == [2, 3, 4]
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_station_metrics():
+    clock = FakeClock()
+    metrics = StationMetrics(capacity=8, window=60.0, clock=clock)
+    for _ in range(3):
+        _run(metrics, clock)
+        clock.now += 1.0
+    result = _run(metrics, clock, failed_step=Step.AUTH)
+    assert not result.ok and result.failed_step is Step.AUTH
+
+    run = metrics.begin("R2")
+    run.finish(error=CommandError("x"))
+    clock.now += 53.0  # 측정 시작 후 60초
+
+    snap = metrics.snapshot()
+    assert snap["totals"] == {"ok": 3, "failed": 2}
+    assert snap["failures"] == {"auth": 1, "exception:CommandError": 1}
+    assert snap["tags_per_minute"] == 3.0
+    assert snap["steps"]["auth"]["count"] == 4
+    assert snap["steps"]["write"]["p50_ms"] == 500.0
+    assert metrics.utilization("R1") == pytest.approx(4 / 60)
+    assert metrics.failure_rate("R1") == 0.25
+    assert metrics.failure_rate("unknown") is None
+
+    # window가 지나면 최근 구간 지표는 비워집니다.
+    clock.now += 120.0
+    assert metrics.tags_per_minute() == 0.0
+    assert metrics.utilization("R1") == 0.0
+    assert metrics.snapshot()["totals"]["ok"] == 3
+
+
+def test_regulator_aimd():
+    clock = FakeClock()
+    metrics = StationMetrics(window=60.0, clock=clock)
+    regulator = Regulator(
+        metrics, max_concurrency=4, base_delay=0.2, max_delay=1.0, min_samples=2
+    )
+
+    _run(metrics, clock)
+    assert regulator.update("R1") == (1, 0.2)  # 표본 부족
+    _run(metrics, clock)
+    assert regulator.update("R1") == (2, 0.2)
+    assert regulator.update("R1") == (2, 0.2)  # 새 기록이 없으면 그대로
+    _run(metrics, clock)
+    assert regulator.update("R1") == (3, 0.2)
+
+    for _ in range(4):
+        _run(metrics, clock, failed_step=Step.WRITE)
+    assert regulator.update("R1") == (1, 0.4)
+    assert regulator.update("R1") == (1, 0.4)
+    for expected in ((1, 0.8), (1, 1.0)):
+        _run(metrics, clock, failed_step=Step.WRITE)
+        assert regulator.update("R1") == expected
+
+    regulator.tune(max_delay="0.5")
+    assert regulator.pacing("R1") == (1, 0.5)
+    for bad in (
+        {"unknown": 1},
+        {"min_samples": 0},
+        {"min_concurrency": 5},
+        {"base_delay": "0.6"},
+        {"max_delay": "-1"},
+    ):
+        with pytest.raises(ValueError):
+            regulator.tune(**bad)
+    assert regulator.min_samples == 2 and regulator.min_concurrency == 1
+    # 기록이 없는 리더기는 표본 수와 관계없이 기본값을 돌려줍니다.
+    assert regulator.update("R2") == (1, 0.2)
+    with pytest.raises(ValueError):
+        Regulator(metrics, min_concurrency=3, max_concurrency=2)
+
+
+def test_metrics_endpoint():
+    metrics = StationMetrics()
+    regulator = Regulator(metrics)
+    metrics.begin("R1").finish()
+    server = serve_metrics(metrics, regulator)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(f"{base}/metrics") as resp:
+            body = json.load(resp)
+        assert body["totals"]["ok"] == 1
+        assert "R1" in body["readers"]
+        assert body["regulator"]["limits"]["max_concurrency"] == 4
+
+        request = Request(f"{base}/regulator?max_concurrency=2", method="POST")
+        with urlopen(request) as resp:
+            assert json.load(resp)["limits"]["max_concurrency"] == 2
+        assert regulator.max_concurrency == 2
+
+        for query in ("bogus=1", "min_samples=0"):
+            with pytest.raises(HTTPError) as e:
+                urlopen(Request(f"{base}/regulator?{query}", method="POST"))
+            assert e.value.code == 400
+        assert regulator.min_samples == 5
+    finally:
+        server.shutdown()
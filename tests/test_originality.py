@@ -0,0 +1,103 @@
+import pytest
+from Crypto.Cipher import AES
+from Crypto.Hash import CMAC
+from Crypto.Util.Padding import pad
+
+from ntag424_python.driver import NTAG424Driver
+from ntag424_python.exceptions import CommandError
+from ntag424_python.originality import OriginalityVerifier
+
+# AN12196 Table 30
+UID = bytes.fromhex("04518DFAA96180")
+SIGNATURE = bytes.fromhex(
+    "D1940D17CFEDA4BFF80359AB975F9F6514313E8F90C1D3CAAF5941AD"
+    "744A1CDF9A83F883CAFE0FE95D1939B1B7E47113993324473B785D21"
+)
+# AN12196 Table 28의 세션 (GetCardUID 예제와 같은 키, TI)
+SES_ENC_KEY = bytes.fromhex("2B4D963C014DC36F24F69A50A394F875")
+SES_MAC_KEY = bytes.fromhex("379D32130CE61705DD5FD8C36B95D764")
+TI = bytes.fromhex("DF055522")
+
+
+def _mac_t(msg):
+    # 드라이버의 crypto.Cmac과 독립적인 참조 구현
+    cobj = CMAC.new(SES_MAC_KEY, ciphermod=AES)
+    cobj.update(msg)
+    return cobj.digest()[1::2]
+
+
+@pytest.fixture(scope="module")
+def verifier():
+    return OriginalityVerifier()
+
+
+def test_an12196_signature_is_valid(verifier):
+    assert verifier.verify(UID, SIGNATURE)
+
+
+def test_wrong_uid_or_signature_is_invalid(verifier):
+    assert not verifier.verify(bytes.fromhex("04518DFAA96181"), SIGNATURE)
+    assert not verifier.verify(UID, SIGNATURE[:-1] + bytes([SIGNATURE[-1] ^ 1]))
+    assert not verifier.verify(UID, SIGNATURE[:40])
+
+
+def test_cached_result_is_keyed_by_signature(verifier):
+    forged = bytes(28) + SIGNATURE[28:]
+    assert verifier.verify(UID, SIGNATURE)
+    assert not verifier.verify(UID, forged)
+    assert verifier.verify(UID, SIGNATURE)
+
+
+def test_verify_many():
+    verifier = OriginalityVerifier(cache_size=1)
+    other = bytes.fromhex("04000000000000")
+    assert verifier.verify_many([(UID, SIGNATURE), (other, SIGNATURE)]) == [True, False]
+    assert len(verifier._results) == 1
+
+
+def test_invalid_public_key_is_rejected():
+    with pytest.raises(ValueError):
+        OriginalityVerifier(public_key=bytes([0x04]) + bytes(56))
+
+
+def test_read_sig_plain(fake_connection):
+    driver = NTAG424Driver()
+    driver.connection = fake_connection([(list(SIGNATURE), 0x91, 0x00)])
+    assert driver.read_sig() == SIGNATURE
+    assert driver.connection.sent == [[0x90, 0x3C, 0x00, 0x00, 0x01, 0x00, 0x00]]
+
+
+def test_read_sig_full(fake_connection):
+    """인증된 세션에서는 CommMode.Full: 64바이트 암호문 + 응답 MAC."""
+    ctr = 5
+    next_ctr = (ctr + 1).to_bytes(2, "little")
+    iv = AES.new(SES_ENC_KEY, AES.MODE_ECB).encrypt(
+        bytes.fromhex("5AA5") + TI + next_ctr + bytes(8)
+    )
+    plain = pad(SIGNATURE, 16, style="iso7816")
+    enc = AES.new(SES_ENC_KEY, AES.MODE_CBC, iv).encrypt(plain)
+    assert len(enc) == 64
+    resp_mac = _mac_t(bytes([0x00]) + next_ctr + TI + enc)
+
+    driver = NTAG424Driver()
+    driver.session.enc_key = SES_ENC_KEY
+    driver.session.mac_key = SES_MAC_KEY
+    driver.session.ti = TI
+    driver.session.cmd_ctr = ctr
+    driver.connection = fake_connection([(list(enc + resp_mac), 0x91, 0x00)])
+
+    assert driver.read_sig() == SIGNATURE
+    cmd_mac = _mac_t(bytes([0x3C]) + ctr.to_bytes(2, "little") + TI + b"\x00")
+    expected = [0x90, 0x3C, 0x00, 0x00, 0x09, 0x00] + list(cmd_mac) + [0x00]
+    assert driver.connection.sent == [expected]
+    assert driver.session.cmd_ctr == ctr + 1
+
+
+def test_read_sig_full_rejects_bad_response_mac(fake_connection):
+    driver = NTAG424Driver()
+    driver.session.enc_key = SES_ENC_KEY
+    driver.session.mac_key = SES_MAC_KEY
+    driver.session.ti = TI
+    driver.connection = fake_connection([(list(bytes(64 + 8)), 0x91, 0x00)])
+    with pytest.raises(CommandError):
+        driver.read_sig()
@@ -0,0 +1,168 @@
+import os
+
+import pytest
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+from ntag424_python.crypto import Cmac
+from ntag424_python.driver import NTAG424Driver
+from ntag424_python.exceptions import AuthenticationError
+from ntag424_python.resolver import KeyResolver
+
+UID = bytes.fromhex("04958CAA5C5E80")
+BOOTSTRAP_KEY = bytes.fromhex("00112233445566778899AABBCCDDEEFF")
+
+
+def derive(key_no: int, uid: bytes) -> bytes:
+    return Cmac(bytes([key_no]) * 16).mac(uid)
+
+
+class FakeTag:
+    """AuthenticateEV2First, GetCardUID, PC/SC GET DATA만 흉내 내는 태그."""
+
+    def __init__(self, uid, keys, random_id=True):
+        self.uid = uid
+        self.keys = keys
+        self.random_id = random_id
+        self.sent = []
+        self.auth_key = None
+
+    def transmit(self, apdu):
+        self.sent.append(apdu)
+        cla, ins = apdu[0], apdu[1]
+        if cla == 0xFF and ins == 0xCA:
+            return list(os.urandom(4) if self.random_id else self.uid), 0x90, 0x00
+        if ins == 0x71:
+            self.pending_key = self.keys[apdu[5]]
+            self.rnd_b = os.urandom(16)
+            cipher = AES.new(self.pending_key, AES.MODE_CBC, bytes(16))
+            return list(cipher.encrypt(self.rnd_b)), 0x91, 0xAF
+        if ins == 0xAF:
+            return self._auth_part2(bytes(apdu[5:37]))
+        if ins == 0x51:
+            return self._get_card_uid(bytes(apdu[5:13]))
+        return [], 0x91, 0x1C
+
+    def _auth_part2(self, enc_token):
+        key = self.pending_key
+        token = AES.new(key, AES.MODE_CBC, bytes(16)).decrypt(enc_token)
+        rnd_a, rnd_b_prime = token[:16], token[16:]
+        if rnd_b_prime != self.rnd_b[1:] + self.rnd_b[:1]:
+            return [], 0x91, 0xAE
+        rnd_b = self.rnd_b
+        xor_part = bytes(a ^ b for a, b in zip(rnd_a[2:8], rnd_b[0:6], strict=True))
+        context = rnd_a[0:2] + xor_part + rnd_b[6:16] + rnd_a[8:16]
+        self.enc_key, self.mac_key = Cmac(key).mac_many(
+            [
+                bytes.fromhex("A55A00010080") + context,
+                bytes.fromhex("5AA500010080") + context,
+            ]
+        )
+        self.ti = os.urandom(4)
+        self.cmd_ctr = 0
+        self.auth_key = key
+        resp = self.ti + rnd_a[1:] + rnd_a[:1] + bytes(12)
+        return list(AES.new(key, AES.MODE_CBC, bytes(16)).encrypt(resp)), 0x91, 0x00
+
+    def _get_card_uid(self, mac):
+        mac_input = bytes([0x51]) + self.cmd_ctr.to_bytes(2, 'little') + self.ti
+        if Cmac(self.mac_key).mac_t(mac_input) != mac:
+            return [], 0x91, 0x1E
+        self.cmd_ctr += 1
+        ctr = self.cmd_ctr.to_bytes(2, 'little')
+        iv_input = bytes.fromhex("5AA5") + self.ti + ctr + bytes(8)
+        iv = AES.new(self.enc_key, AES.MODE_ECB).encrypt(iv_input)
+        plain = pad(self.uid, 16, style='iso7816')
+        enc = AES.new(self.enc_key, AES.MODE_CBC, iv).encrypt(plain)
+        resp_mac = Cmac(self.mac_key).mac_t(bytes([0x00]) + ctr + self.ti + enc)
+        return list(enc + resp_mac), 0x91, 0x00
+
+
+def _driver(connection):
+    driver = NTAG424Driver()
+    driver.connection = connection
+    return driver
+
+
+def _commands(tag):
+    return [apdu[1] for apdu in tag.sent]
+
+
+def test_get_card_uid_an12196(fake_connection):
+    """AN12196 Table 28: GetCardUID (CommMode.Full)."""
+    resp = bytes.fromhex("70756055688505B52A5E26E59E329CD6595F672298EA41B7")
+    driver = _driver(fake_connection([(list(resp), 0x91, 0x00)]))
+    driver.session.enc_key = bytes.fromhex("2B4D963C014DC36F24F69A50A394F875")
+    driver.session.mac_key = bytes.fromhex("379D32130CE61705DD5FD8C36B95D764")
+    driver.session.ti = bytes.fromhex("DF055522")
+    driver.session.cmd_ctr = 0
+
+    assert driver.get_card_uid() == UID
+    expected = bytes.fromhex("90510000088E2C155ADDA99BE300")
+    assert driver.connection.sent[0] == list(expected)
+    assert driver.session.cmd_ctr == 1
+
+
+def test_get_card_uid_requires_auth(fake_connection):
+    with pytest.raises(AuthenticationError):
+        _driver(fake_connection([])).get_card_uid()
+
+
+def test_random_id_bootstraps_then_switches_key():
+    tag = FakeTag(UID, {2: BOOTSTRAP_KEY, 0: derive(0, UID)})
+    driver = _driver(tag)
+    resolver = KeyResolver(derive, bootstrap_key_no=2, bootstrap_key=BOOTSTRAP_KEY)
+
+    result = resolver.resolve(driver, key_no=0)
+    assert result.uid == UID and result.key == derive(0, UID) and result.bootstrapped
+    assert tag.auth_key == derive(0, UID)
+    # GET DATA, 부트스트랩 인증, GetCardUID, 파생 키 인증 (SELECT 없음)
+    assert _commands(tag) == [0xCA, 0x71, 0xAF, 0x51, 0x71, 0xAF]
+    # 재인증 후 드라이버 세션이 태그와 일치해야 합니다.
+    assert driver.session.mac_key == tag.mac_key and driver.session.ti == tag.ti
+
+
+def test_fixed_uid_skips_bootstrap():
+    tag = FakeTag(UID, {0: derive(0, UID)}, random_id=False)
+    resolver = KeyResolver(derive, bootstrap_key_no=2, bootstrap_key=BOOTSTRAP_KEY)
+
+    result = resolver.resolve(_driver(tag), key_no=0)
+    assert result.uid == UID and not result.bootstrapped
+    assert _commands(tag) == [0xCA, 0x71, 0xAF]
+
+
+def test_bootstrap_key_is_target_key():
+    tag = FakeTag(UID, {2: BOOTSTRAP_KEY})
+    resolver = KeyResolver(lambda key_no, uid: BOOTSTRAP_KEY, 2, BOOTSTRAP_KEY)
+
+    result = resolver.resolve(_driver(tag), key_no=2)
+    assert result.uid == UID
+    assert _commands(tag) == [0xCA, 0x71, 0xAF, 0x51]
+
+
+def test_wrong_key_raises():
+    tag = FakeTag(UID, {2: BOOTSTRAP_KEY, 0: os.urandom(16)})
+    resolver = KeyResolver(derive, 2, BOOTSTRAP_KEY)
+    driver = _driver(tag)
+    with pytest.raises(AuthenticationError):
+        resolver.resolve(driver, key_no=0)
+    # 부트스트랩 세션 키가 남아 있으면 안 됩니다 (태그는 이미 인증을 버림).
+    assert not driver.session.is_authenticated
+
+
+def test_prewarm_and_cache_bound():
+    calls = []
+
+    def key_for(key_no, uid):
+        calls.append((key_no, uid))
+        return derive(key_no, uid)
+
+    resolver = KeyResolver(key_for, 2, BOOTSTRAP_KEY, cache_size=3)
+    uids = [bytes([4, i, 0, 0, 0, 0, 0]) for i in range(2)]
+    assert resolver.prewarm(uids, key_nos=(0, 1)) == 3
+    assert len(calls) == 4
+
+    resolver.key(1, uids[1])
+    assert len(calls) == 4
+    resolver.key(0, uids[0])
+    assert len(calls) == 5
@@ -0,0 +1,146 @@
+from Crypto.Cipher import AES
+
+from ntag424_python.layout import (
+    build_ndef_file,
+    calculate_layout,
+    calculate_offsets,
+    mac_input_from_url,
+    parse_file_data,
+    parse_sun_url,
+)
+from ntag424_python.sdm import (
+    Tap,
+    calc_sdm_mac,
+    decrypt_file_data,
+    decrypt_file_data_batch,
+    decrypt_picc_data,
+    derive_session_enc_key,
+    derive_session_mac_key,
+    verify_sun,
+)
+from ntag424_python.verify import SunVerifier, verify_url
+
+ZERO_KEY = bytes(16)
+
+# AN12196 Table 2, Table 4
+ENC_PICC_DATA = bytes.fromhex("EF963FF7828658A599F3041510671E88")
+UID = bytes.fromhex("04DE5F1EACC040")
+SDM_MAC = bytes.fromhex("94EED9EE65337086")
+
+
+def test_decrypt_picc_data_an12196():
+    uid, read_ctr = decrypt_picc_data(ENC_PICC_DATA, ZERO_KEY)
+    assert uid == UID
+    assert read_ctr == 0x3D
+
+
+def test_session_mac_key_an12196():
+    key = derive_session_mac_key(ZERO_KEY, UID, 0x3D)
+    assert key == bytes.fromhex("3FB5F6E3A807A03D5E3570ACE393776F")
+    assert calc_sdm_mac(key) == SDM_MAC
+
+
+def test_sdm_mac_with_input_an12196():
+    # AN12196 Table 5 (SDMMACInputOffset != SDMMACOffset)
+    key = derive_session_mac_key(ZERO_KEY, bytes.fromhex("04958CAA5C5E80"), 8)
+    assert key == bytes.fromhex("3ED0920E5E6A0320D823D5987FEAFBB1")
+    mac_input = b"CEE9A53E3E463EF1F459635736738962&cmac="
+    assert calc_sdm_mac(key, mac_input) == bytes.fromhex("ECC1E7F6C6C73BF6")
+
+
+def test_verify_sun():
+    assert verify_sun(ENC_PICC_DATA, SDM_MAC, ZERO_KEY, ZERO_KEY).valid
+    assert not verify_sun(ENC_PICC_DATA, bytes(8), ZERO_KEY, ZERO_KEY).valid
+    wrong_key = verify_sun(ENC_PICC_DATA, SDM_MAC, bytes([1]) * 16, ZERO_KEY)
+    assert not wrong_key.valid
+
+
+def _tag_url(base_url, uid, read_ctr, meta_key, file_key):
+    """태그가 하는 일을 흉내 내어 main.py 레이아웃의 SUN URL을 만듭니다."""
+    template, picc_offset, cmac_offset = calculate_offsets(base_url)
+    picc_data = bytes([0xC7]) + uid + read_ctr.to_bytes(3, "little") + bytes(5)
+    enc = AES.new(meta_key, AES.MODE_CBC, bytes(16)).encrypt(picc_data)
+    file_data = bytearray(build_ndef_file(template))
+    file_data[picc_offset:picc_offset + 32] = enc.hex().upper().encode()
+    key = derive_session_mac_key(file_key, uid, read_ctr)
+    mac = calc_sdm_mac(key, bytes(file_data[:cmac_offset]))
+    file_data[cmac_offset:cmac_offset + 16] = mac.hex().upper().encode()
+    return file_data[7:].decode()
+
+
+def test_verify_url_roundtrip():
+    base_url = "https://challenge.walkd.co.kr/dashboard"
+    url = _tag_url(base_url, UID, 5, ZERO_KEY, ZERO_KEY)
+    assert parse_sun_url(url)[0] != bytes(16)
+    assert len(mac_input_from_url(url)) == calculate_offsets(base_url)[2]
+    result = verify_url(url, ZERO_KEY, ZERO_KEY)
+    assert result.valid and result.uid == UID and result.read_ctr == 5
+    tampered = url.replace("dashboard", "dashboarD")
+    assert not verify_url(tampered, ZERO_KEY, ZERO_KEY).valid
+
+
+# AN12196 Table 3 (SDMENCFileData)
+ENC_UID = bytes.fromhex("04958CAA5C5E80")
+ENC_FILE_DATA = bytes.fromhex("94592FDE69FA06E8E3B6CA686A22842B")
+
+
+def test_session_enc_key_an12196():
+    key = derive_session_enc_key(ZERO_KEY, ENC_UID, 1)
+    assert key == bytes.fromhex("8097D73344D53F963B09E23E03B62336")
+
+
+def test_decrypt_file_data_an12196():
+    assert decrypt_file_data(ZERO_KEY, ENC_UID, 1, ENC_FILE_DATA) == b"x" * 16
+
+
+def test_decrypt_file_data_batch():
+    lookups = []
+
+    def file_key_for(uid):
+        lookups.append(uid)
+        return ZERO_KEY
+
+    other = Tap(UID, 2, ENC_FILE_DATA)
+    taps = [Tap(ENC_UID, 1, ENC_FILE_DATA), other, Tap(ENC_UID, 1, ENC_FILE_DATA)]
+    plain = decrypt_file_data_batch(taps, file_key_for)
+    assert plain[0] == plain[2] == b"x" * 16
+    assert plain[1] == decrypt_file_data(ZERO_KEY, UID, 2, ENC_FILE_DATA)
+    assert lookups == [ENC_UID, UID]
+
+
+def test_verify_with_data_roundtrip():
+    base_url = "https://challenge.walkd.co.kr/dashboard"
+    payload = b"WALKD-TOKEN-0001"
+    layout = calculate_layout(base_url, len(payload))
+    read_ctr = 9
+
+    # 태그 동작 흉내: PICCData 암호화, 평문 자리 암호화, SDMMAC 계산
+    file_data = bytearray(layout.file_data(payload))
+    picc_data = bytes([0xC7]) + UID + read_ctr.to_bytes(3, "little") + bytes(5)
+    enc = AES.new(ZERO_KEY, AES.MODE_CBC, bytes(16)).encrypt(picc_data)
+    picc_field = slice(layout.picc_data_offset, layout.picc_data_offset + 32)
+    file_data[picc_field] = enc.hex().upper().encode()
+    enc_key = derive_session_enc_key(ZERO_KEY, UID, read_ctr)
+    iv_input = read_ctr.to_bytes(3, "little") + bytes(13)
+    iv = AES.new(enc_key, AES.MODE_ECB).encrypt(iv_input)
+    enc_data = AES.new(enc_key, AES.MODE_CBC, iv).encrypt(payload)
+    enc_field = slice(layout.enc_offset, layout.enc_offset + layout.enc_length)
+    file_data[enc_field] = enc_data.hex().upper().encode()
+    mac_key = derive_session_mac_key(ZERO_KEY, UID, read_ctr)
+    mac = calc_sdm_mac(mac_key, bytes(file_data[:layout.cmac_offset]))
+    file_data[layout.cmac_offset:layout.cmac_offset + 16] = mac.hex().upper().encode()
+    url = file_data[7:].decode()
+
+    assert parse_file_data(url) == enc_data
+    lookups = []
+
+    def file_key_for(uid):
+        lookups.append(uid)
+        return ZERO_KEY
+
+    verifier = SunVerifier(ZERO_KEY, file_key_for)
+    result, plaintext = verifier.verify_with_data(url)
+    assert result.valid and plaintext == payload
+    assert lookups == [UID]
+    # 재사용된 URL은 평문을 돌려주지 않습니다.
+    assert verifier.verify_with_data(url) == (result._replace(valid=False), b"")
@@ -0,0 +1,52 @@
+from ntag424_python.session import (
+    TAG_RESULT_SIZE,
+    VERIFICATION_RESULT_SIZE,
+    SessionState,
+    Step,
+    TagResult,
+    VerificationResult,
+    pack_results,
+)
+
+UID = bytes.fromhex("04DE5F1EACC040")
+
+
+def test_session_state_roundtrip():
+    session = SessionState(
+        ti=bytes.fromhex("9D00C4DF"),
+        cmd_ctr=1,
+        enc_key=bytes.fromhex("1309C877509E5A215007FF0ED19CA564"),
+        mac_key=bytes.fromhex("4C6626F5E72EA694202139295C7A7FC7"),
+    )
+    data = session.to_bytes()
+    assert len(data) == SessionState.STRUCT.size == 38
+    assert SessionState.from_bytes(data) == session
+
+
+def test_unauthenticated_session_roundtrip():
+    restored = SessionState.from_bytes(SessionState().to_bytes())
+    assert not restored.is_authenticated
+    assert restored.ti is None
+
+
+def test_result_types_have_no_instance_dict():
+    objs = (SessionState(), TagResult(UID, True), VerificationResult(UID, 61, True))
+    for obj in objs:
+        assert not hasattr(obj, "__dict__")
+
+
+def test_tag_result_journal():
+    results = [
+        TagResult(UID, True, timestamp=1.5),
+        TagResult(UID, False, Step.SETTINGS, 2.0),
+    ]
+    data = pack_results(results)
+    assert len(data) == 2 * TAG_RESULT_SIZE
+    assert list(TagResult.iter_from_bytes(data)) == results
+
+
+def test_verification_result_journal():
+    results = [VerificationResult(UID, 61, True), VerificationResult(UID, 62, False)]
+    data = pack_results(results)
+    assert VerificationResult.from_bytes(data[:VERIFICATION_RESULT_SIZE]) == results[0]
+    assert list(VerificationResult.iter_from_bytes(data)) == results
@@ -0,0 +1,7 @@
+from ntag424_python.stats import percentile
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert [percentile(values, q) for q in (0, 50, 90, 100)] == [1.0, 3.0, 5.0, 5.0]